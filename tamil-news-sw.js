@@ -0,0 +1,34 @@
+// Tamil News Dashboard – service worker
+// ─────────────────────────────────────────────────────────────────
+// Keeps the dashboard page itself in Cache Storage so a reopened tab
+// paints without waiting for the network.  Every visit answers from the
+// cache and revalidates in the background; the HTTP cache sends the
+// page's ETag, so an unchanged page costs a 304.  News and catalogue
+// data are cached by the page in IndexedDB (see the dashboard script).
+
+const SHELL_CACHE = 'tamil-news-shell-v1';
+
+self.addEventListener('install',  () => self.skipWaiting());
+
+self.addEventListener('activate', e => e.waitUntil((async () => {
+    for (const name of await caches.keys())
+        if (name !== SHELL_CACHE) await caches.delete(name);
+    await self.clients.claim();
+})()));
+
+self.addEventListener('fetch', e => {
+    const url = new URL(e.request.url);
+    if (e.request.method !== 'GET' || url.origin !== location.origin) return;
+    if (url.pathname === '/') e.respondWith(staleWhileRevalidate(e));
+});
+
+async function staleWhileRevalidate(e) {
+    const cache   = await caches.open(SHELL_CACHE);
+    const cached  = await cache.match(e.request, { ignoreSearch:true });
+    const network = fetch(e.request, { cache:'no-cache' }).then(r => {
+        if (r.ok) cache.put(e.request, r.clone());
+        return r;
+    });
+    e.waitUntil(network.catch(() => {}));
+    return cached || network;
+}
@@ -0,0 +1,7 @@
+"""
+Tamil News – scraper package.
+
+tamil_news.collector holds the Flask-free scraping core; the web server
+(tamil_news_server_final.py) and the headless CLI (python -m tamil_news)
+both import it.
+"""
@@ -0,0 +1,139 @@
+"""
+Headless collector CLI
+======================
+    python -m tamil_news collect --once                       # one cycle, then exit
+    python -m tamil_news collect --papers dinamalar,bbc --out /tmp/news.json
+    python -m tamil_news collect --daemon --interval 900      # cron-less loop
+
+    python -m tamil_news enqueue                              # sharded: plan a cycle
+    python -m tamil_news work --until-empty                   #   … on every node
+    python -m tamil_news merge --cycle 12                     #   … fold one by hand
+
+Runs full_scrape without Flask.  Arguments are parsed before the
+collector (requests, BeautifulSoup, …) is imported, so --help and bad
+arguments return immediately.  Prints timing stats after every cycle;
+exits 1 when a one-shot cycle collects nothing.
+"""
+
+import argparse
+import sys
+import time
+
+
+def _parse_args(argv):
+    ap = argparse.ArgumentParser(prog='python -m tamil_news',
+                                 description='Tamil News headless collector')
+    sub = ap.add_subparsers(dest='command', required=True)
+    c = sub.add_parser('collect', help='scrape the selected newspapers and write a snapshot')
+    mode = c.add_mutually_exclusive_group()
+    mode.add_argument('--once', action='store_true', default=True,
+                      help='run one cycle and exit (default)')
+    mode.add_argument('--daemon', action='store_true',
+                      help='keep scraping every --interval seconds')
+    c.add_argument('--interval', type=int, default=900, metavar='SECONDS',
+                   help='daemon cycle length (default: 900)')
+    c.add_argument('--papers', default='', metavar='KEY,KEY',
+                   help='catalogue keys to scrape (default: the saved selection)')
+    c.add_argument('--out', default=None, metavar='PATH',
+                   help='snapshot file (default: news_live.json)')
+    c.add_argument('--no-compress', action='store_true',
+                   help='skip the .gz / .br variants')
+
+    # sharded scraping (tamil_news/shards.py)
+    q = argparse.ArgumentParser(add_help=False)
+    q.add_argument('--queue', default=None, metavar='PATH',
+                   help='work-queue database (default: $TAMIL_NEWS_QUEUE or work_queue.db)')
+    e = sub.add_parser('enqueue', parents=[q], help='queue one cycle as (paper, pass) units')
+    e.add_argument('--papers', default='', metavar='KEY,KEY',
+                   help='catalogue keys to scrape (default: the saved selection)')
+    e.add_argument('--out', default=None, metavar='PATH',
+                   help='snapshot the merge writes (default: news_live.json)')
+    w = sub.add_parser('work', parents=[q], help='claim and run queued units')
+    w.add_argument('--until-empty', action='store_true',
+                   help='exit once no unit is left instead of polling')
+    m = sub.add_parser('merge', parents=[q], help='merge a cycle into its snapshot')
+    m.add_argument('--cycle', type=int, default=None, help='cycle id (default: newest)')
+    m.add_argument('--force', action='store_true',
+                   help='merge even if units are still pending')
+    sub.add_parser('queue', parents=[q], help='show unit counts per cycle')
+    return ap, ap.parse_args(argv)
+
+
+def _paper_keys(ap, core, arg):
+    papers = [k.strip() for k in arg.split(',') if k.strip()]
+    unknown = [k for k in papers if k not in core.NEWSPAPERS]
+    if unknown:
+        ap.error(f"unknown paper(s): {', '.join(unknown)} "
+                 f"(choose from {', '.join(core.NEWSPAPERS)})")
+    return papers
+
+
+def _print_stats(core, out):
+    cycle = core.LAST_CYCLE
+    print(f"⏱️  {cycle['articles']} articles ({cycle['trending']} trending) "
+          f"in {cycle['seconds']:.1f}s → {out}")
+    for key, p in sorted(cycle['papers'].items(), key=lambda kv: -kv[1]['seconds']):
+        print(f"    {core.NEWSPAPERS[key]['english']:<22} {p['seconds']:6.1f}s  "
+              f"{p['headlines']:4d} headlines  {p['fetched']:3d} fetched  "
+              f"{p['articles']:4d} articles")
+    sys.stdout.flush()
+
+
+def _collect(ap, args):
+    t_start = time.time()
+    from tamil_news import collector as core        # heavy imports start here
+    t_import = time.time() - t_start
+
+    papers = _paper_keys(ap, core, args.papers)
+    out = args.out or core.LIVE_NEWS
+    print(f"📦 collector ready in {t_import * 1000:.0f} ms", flush=True)
+
+    while True:
+        try:
+            data = core.full_scrape(papers or None)
+            if data:                   # an outage must not empty the live feed
+                core._publish_snapshot(out, data, precompress=not args.no_compress, archive=True)
+            else:
+                core._log(f"⚠️  nothing collected – {out} left as it was")
+        except Exception as e:
+            core._log(f"❌ collect error: {e}")
+            data = []
+        _print_stats(core, out)
+        if not args.daemon:
+            return 0 if data else 1
+        time.sleep(max(0, args.interval - core.LAST_CYCLE['seconds']))
+
+
+def _sharded(ap, args):
+    from tamil_news import collector as core, shards
+    if args.command == 'enqueue':
+        shards.enqueue_cycle(_paper_keys(ap, core, args.papers) or None, args.out, args.queue)
+        return 0
+    if args.command == 'work':
+        t0 = time.time()
+        ran = shards.work(args.queue, until_empty=args.until_empty)
+        print(f"⏱️  {ran} units in {time.time() - t0:.1f}s", flush=True)
+        return 0
+    if args.command == 'merge':
+        data = shards.merge_cycle(args.cycle, args.queue, force=args.force)
+        if data is None:
+            print("ℹ️  nothing merged (cycle unfinished, already merged or unknown)")
+        return 0 if data else 1
+    for cycle, c in shards.queue_stats(args.queue).items():
+        print(f"cycle {cycle:>5}  todo {c['todo']:3d}  claimed {c['claimed']:3d}  "
+              f"done {c['done']:3d}  {'merged' if c['merged'] else ''}")
+    return 0
+
+
+def main(argv=None):
+    ap, args = _parse_args(argv)
+    try:
+        if args.command == 'collect':
+            return _collect(ap, args)
+        return _sharded(ap, args)
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2299 @@
+"""
+Tamil News collector
+====================
+Everything that scrapes, ranks and publishes the news snapshot – the
+catalogue, the two-pass scraper, ranking, snapshot/status files and the
+background loop.  Nothing here imports Flask: the web server
+(tamil_news_server_final.py) and the headless CLI (python -m tamil_news)
+both build on this module.
+
+requests, BeautifulSoup / soupsieve and the search / history stores are
+imported on first use, so importing the collector (the CLI, a web
+worker that only serves snapshots) stays cheap.
+"""
+
+from datetime import datetime, timedelta, timezone
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future, wait, FIRST_COMPLETED
+from array import array
+import time
+import os
+import random
+import threading
+import json
+import sys
+import gzip
+import html
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from collections import Counter, OrderedDict, namedtuple
+from itertools import chain, count
+from contextlib import contextmanager
+import heapq
+import hashlib
+import base64
+import zlib
+from urllib.parse import urlsplit, urlunsplit, urljoin, parse_qsl, urlencode
+import fnmatch
+
+try:
+    from dateutil import parser as date_parser
+except ImportError:
+    date_parser = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl                    # POSIX file locks …
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt                   # … or their Windows counterpart
+except ImportError:
+    msvcrt = None
+
+
+# ─── paths ──────────────────────────────────────────────────────────
+BASE_DIR        = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))   # repo root
+MAIN_HTML       = os.path.join(BASE_DIR, 'tamil-news-dashboard-final.html')
+SERVICE_WORKER  = os.path.join(BASE_DIR, 'tamil-news-sw.js')
+TEMP_NEWS       = os.path.join(BASE_DIR, 'news_temp.json')
+LIVE_NEWS       = os.path.join(BASE_DIR, 'news_live.json')
+USER_PREFS_FILE = os.path.join(BASE_DIR, 'user_newspapers.json')   # ← persisted selections, per user
+PROFILE_DIR     = os.path.join(BASE_DIR, 'profiles')                # ← per-cycle profiles
+STATUS_FILE     = os.path.join(BASE_DIR, 'news_status.json')        # ← collector → web workers
+CONTROL_DIR     = os.path.join(BASE_DIR, 'control')                 # ← web workers → collector
+COLLECTOR_PID   = os.path.join(BASE_DIR, '.collector.pid')          # ← held by the one collector
+
+# ─── process role ───────────────────────────────────────────────────
+# all       → one process: Flask dev server + background scrape loop
+# collector → scrape loop only; publishes snapshots + news_status.json
+# web       → API only (e.g. N gunicorn workers); reads what the
+#             collector publishes and never scrapes itself
+ROLE = os.environ.get('TAMIL_NEWS_ROLE', 'all')
+
+# ─── shared state ───────────────────────────────────────────────────
+STATE = {
+    'is_scraping':     False,
+    'last_scrape':     None,
+    'scrape_progress': '',
+    'profile_next':    False,     # armed via POST /api/profile
+    'last_profile':    None,
+    'fetch_limits':    {},        # host → AIMD limit + latency, as of the last cycle
+}
+STATE_LOCK = threading.Lock()
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36',
+]
+
+# ─── newspaper catalogue  (ORDER = priority the user asked for) ────
+# Python 3.7+ dicts preserve insertion order.  The first 10 keys are
+# the user's priority list; the remaining 4 are extras that are
+# available in the dropdown but OFF by default.
+#
+# Optional 'feeds' = RSS / Atom / news-sitemap URLs used as a cheap
+# pass 1 (see FEEDS below).
+#
+# Optional 'profile' = CSS selectors for that site's own markup:
+#   'headlines' → headline anchors (or blocks containing them)
+#   'body'      → article paragraphs
+#   'timestamp' → element carrying the publish time (datetime/content
+#                 attribute or text)
+# Profiled sites go straight to those nodes; anything missing or
+# matching nothing falls back to the generic heuristics.
+NEWSPAPERS = {
+    # ── priority 1-10  (default ON) ─────────────────────────────────
+    'dinamalar': {
+        'url':     'https://www.dinamalar.com/',
+        'tamil':   'தினமலர்',
+        'english': 'Dinamalar',
+        'sections': ['https://www.dinamalar.com/news/'],
+    },
+    'dailythanthi': {
+        'url':     'https://www.dailythanthi.com/',
+        'tamil':   'தினத்தந்தி',
+        'english': 'Daily Thanthi',
+        'sections': ['https://www.dailythanthi.com/tamil/'],
+    },
+    'thehindu': {
+        'url':     'https://tamil.thehindu.com/',
+        'tamil':   'தி இந்து தமிழ்',
+        'english': 'The Hindu Tamil',
+        'sections': ['https://tamil.thehindu.com/latest/'],
+    },
+    'bbc': {
+        'url':     'https://www.bbc.com/tamil',
+        'tamil':   'பிபிசி தமிழ்',
+        'english': 'BBC Tamil',
+        'sections': ['https://www.bbc.com/tamil/articles'],
+        'feeds':    ['https://feeds.bbci.co.uk/tamil/rss.xml'],
+        'profile': {
+            'headlines': 'a[href*="/tamil/articles/"]',
+            'body':      'main p',
+            'timestamp': 'time[datetime]',
+        },
+        'canonical': {'drop_params': ['at_*', 'xtor'],    # feed / share analytics tags
+                      'amp': True, 'https': True},        # articles/<id>.amp
+    },
+    'anandha_vikatan': {
+        'url':     'https://www.anavex.com/',          # primary
+        'tamil':   'ஆனந்த விகடன்',
+        'english': 'Anandha Vikatan',
+        'sections': ['https://www.vikatan.com/news/tamil/'],
+    },
+    'kumudham': {
+        'url':     'https://www.kumudham.com/',
+        'tamil':   'குமுதம்',
+        'english': 'Kumudham',
+        'sections': ['https://www.kumudham.com/news/'],
+    },
+    'dinamani': {
+        'url':     'https://www.dinamani.com/',
+        'tamil':   'தினமணி',
+        'english': 'Dinamani',
+        'sections': ['https://www.dinamani.com/latest-news/'],
+    },
+    'kaalai_kadhir': {
+        'url':     'https://www.kaalaikadhir.com/',
+        'tamil':   'காலை கதிர்',
+        'english': 'Kaalai Kadhir',
+        'sections': [],
+    },
+    'dinakaran': {
+        'url':     'https://www.dinakaran.com/',
+        'tamil':   'தினகரன்',
+        'english': 'Dinakaran',
+        'sections': ['https://www.dinakaran.com/news/'],
+    },
+    'maalaimurasu': {
+        'url':     'https://www.maalaimurasu.com/',
+        'tamil':   'மாலை முரச்ச',
+        'english': 'Maalai Murasu',
+        'sections': [],
+    },
+    # ── extras  (default OFF) ───────────────────────────────────────
+    'maalaimalar': {
+        'url':     'https://www.maalaimalar.com/',
+        'tamil':   'மாலைமலர்',
+        'english': 'Maalai Malar',
+        'sections': [],
+    },
+    'thinaboomi': {
+        'url':     'https://www.thinaboomi.com/',
+        'tamil':   'தினபூமி',
+        'english': 'Thinaboomi',
+        'sections': [],
+    },
+    'viduthalai': {
+        'url':     'https://www.viduthalai.in/',
+        'tamil':   'விடுதலை',
+        'english': 'Viduthalai',
+        'sections': [],
+    },
+    'dinasudar': {
+        'url':     'https://www.dinasudar.com/',
+        'tamil':   'தினசுடர்',
+        'english': 'Dinasudar',
+        'sections': [],
+    },
+}
+
+# Default = first 10 keys (the priority list)
+DEFAULT_SELECTED = list(NEWSPAPERS.keys())[:10]
+
+def _compile_profiles():
+    """key → {'headlines'|'body'|'timestamp': compiled selector}."""
+    import soupsieve
+    out = {}
+    for key, info in NEWSPAPERS.items():
+        compiled = {}
+        for part, css in info.get('profile', {}).items():
+            try:
+                compiled[part] = soupsieve.compile(css)
+            except Exception as e:
+                _log(f"⚠️  {key}: bad '{part}' selector {css!r}: {e}")
+        if compiled:
+            out[key] = compiled
+    return out
+
+_PROFILES = None
+
+def _site_selector(key, part):
+    """Compiled profile selector of one site (all compiled on first use)."""
+    global _PROFILES
+    if _PROFILES is None:
+        _PROFILES = _compile_profiles()
+    return _PROFILES.get(key, {}).get(part)
+
+# ─── word lists ─────────────────────────────────────────────────────
+GENERIC_SKIP = [
+    'ஒரு பார்வை','சிறப்புக் கட்டுரைகள்','சிறப்பு கட்டுரை',
+    'தலையங்கம்','செย்தித் தொகுப்பு','தொகுப்பு',
+    'புகைப்படங்கள்','வீடியோ','சூழல்','பின்னணி','விளக்கம்',
+    'editorial','opinion','compilation','overview',
+    'gallery','video','background',
+]
+ENGAGEMENT_WORDS = [
+    'மரணம்','கொலை','விபத்து','பரபர','சம்பவம்','அதிர்ச்சி',
+    'வெளியானது','தீர்ப்பு','போராட்டம்','தாக்குதல்','கைது',
+    'வழக்கு','நடவடிக்கை','எதிர்ப்பு','பதற்றம்','சிக்கல்',
+    'குற்றச்சாట்டு','முடிவு','அறிவிப்பு','வெற்றி','தடக்கம்',
+]
+NAV_WORDS = [
+    'home','menu','login','search','epaper','e-paper','signin',
+    'register','signup','subscribe','contact us','about us',
+    'terms','privacy','cookie','advertisement','sponsor',
+    'careers','help','faq','sitemap',
+    'அறிமுகம்','தொடர்பு','சந்தா','கிட்ட மேலும்',
+]
+
+# ════════════════════════════════════════════════════════════════════
+# USER-PREF FILE  (read / write user_newspapers.json)
+# ════════════════════════════════════════════════════════════════════
+# Each named user keeps their own selection:
+#     {"users": {"default": ["dinamalar", …], "amma": ["bbc", …]}}
+# One scrape covers the union of every user's papers; each user reads
+# a projection of that one snapshot (USER VIEWS below), so adding users
+# adds no scraping.  The file is parsed again only when it changes;
+# writers lock it (user_newspapers.json.lock) for the read-modify-write.
+# An older {"selected": […]} file is the "default" user.
+
+DEFAULT_USER = 'default'
+_USER_RE     = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+_PREFS_LOCK  = threading.Lock()
+_prefs_cache = (None, {})          # (file version, {user: [keys]})
+
+def valid_user(name):
+    return bool(name and _USER_RE.match(name))
+
+def _read_users(fresh=False):
+    """{user: [selected keys]} – always has DEFAULT_USER, never an empty list.
+
+    fresh skips the cache (read-modify-writes, under the file lock).
+    """
+    global _prefs_cache
+    try:
+        st = os.stat(USER_PREFS_FILE)
+        version = (st.st_mtime_ns, st.st_ino, st.st_size)   # every write is a new file
+    except OSError:
+        version = None
+    with _PREFS_LOCK:
+        if fresh or version is None or version != _prefs_cache[0]:
+            try:
+                with open(USER_PREFS_FILE, 'rb') as f:
+                    raw = _loads(f.read())
+                users = raw.get('users') or {DEFAULT_USER: raw.get('selected', [])}
+            except:                                    # file missing / corrupt
+                users = {}
+            clean = {}
+            for name, sel in users.items():
+                valid = [k for k in sel if k in NEWSPAPERS]   # drop stale keys
+                if valid_user(name):
+                    clean[name] = valid or list(DEFAULT_SELECTED)
+            clean.setdefault(DEFAULT_USER, list(DEFAULT_SELECTED))
+            _prefs_cache = (version, clean)
+        return {k: list(v) for k, v in _prefs_cache[1].items()}
+
+def _read_selection(user=None):
+    """One user's selected keys; with no user, the union (what gets scraped)."""
+    users = _read_users()
+    if user is not None:
+        return users.get(user, list(DEFAULT_SELECTED))
+    wanted = set(chain.from_iterable(users.values()))
+    return [k for k in NEWSPAPERS if k in wanted]
+
+def _write_selection(keys, user=DEFAULT_USER):
+    """Persist one user's selection atomically (web workers and the collector share the file)."""
+    with _file_lock(USER_PREFS_FILE):
+        users = _read_users(fresh=True)
+        users[user] = keys
+        _write_json(USER_PREFS_FILE, {'users': users})
+
+def _delete_user(user):
+    """Drop a user (never the default one); False if there was none."""
+    with _file_lock(USER_PREFS_FILE):
+        users = _read_users(fresh=True)
+        if user == DEFAULT_USER or users.pop(user, None) is None:
+            return False
+        _write_json(USER_PREFS_FILE, {'users': users})
+        return True
+
+# ════════════════════════════════════════════════════════════════════
+# UTILITY
+# ════════════════════════════════════════════════════════════════════
+
+def _log(msg):
+    print(msg, flush=True)
+    _set_state(scrape_progress=msg)
+
+# ── state shared across processes ──────────────────────────────────
+# The collector mirrors STATE into news_status.json (progress-only
+# updates at most once a second); web workers answer /api/status from
+# that file.  Web → collector requests are empty files in control/.
+_SHARED_KEYS        = ('is_scraping', 'last_scrape', 'scrape_progress', 'last_profile',
+                       'fetch_limits')
+_STATUS_INTERVAL    = 1.0
+_last_status_write  = 0.0
+
+def _set_state(**fields):
+    global _last_status_write
+    with STATE_LOCK:
+        STATE.update(fields)
+        snap = {k: STATE[k] for k in _SHARED_KEYS}
+    if ROLE != 'collector':
+        return
+    now = time.time()
+    if set(fields) == {'scrape_progress'} and now - _last_status_write < _STATUS_INTERVAL:
+        return
+    _last_status_write = now
+    snap['pid']     = os.getpid()
+    snap['updated'] = datetime.now()
+    try:  _write_json(STATUS_FILE, snap)
+    except OSError: pass
+
+def _shared_state():
+    """STATE as this process should report it (the collector's, for web workers)."""
+    if ROLE == 'web':
+        st = _read_json(STATUS_FILE)
+        return st if isinstance(st, dict) else {}
+    with STATE_LOCK:
+        return {k: STATE[k] for k in _SHARED_KEYS}
+
+def _request_collector(action):
+    os.makedirs(CONTROL_DIR, exist_ok=True)
+    open(os.path.join(CONTROL_DIR, action), 'a').close()
+
+def _take_request(action):
+    try:
+        os.remove(os.path.join(CONTROL_DIR, action))
+        return True
+    except OSError:
+        return False
+
+class _LRU:
+    """Thread-safe bounded mapping; least recently used entries fall out."""
+    def __init__(self, size):
+        self.size  = size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        """(key, value) pairs, oldest first."""
+        with self._lock:
+            return list(self._data.items())
+
+def _soup(markup):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(markup, 'html.parser')
+
+def _headers():
+    return {
+        'User-Agent':      random.choice(USER_AGENTS),
+        'Cache-Control':   'no-cache, no-store, must-revalidate',
+        'Pragma':          'no-cache',
+        'Expires':         '0',
+        'Accept-Language': 'ta-IN,ta;q=0.9,en-IN;q=0.8,en;q=0.7',
+    }
+
+def _abs_url(base, href):
+    """href as found on page base → absolute, canonical URL."""
+    return _canonical(urljoin(base, href.strip()))
+
+# ════════════════════════════════════════════════════════════════════
+# URL CANONICALISATION  (one story → one URL)
+# ════════════════════════════════════════════════════════════════════
+# Every link is reduced to one form before it is deduped, scheduled or
+# fetched:
+#   • host of the catalogue entry: www. / m. / amp. / mobile. twins
+#     fold onto the host the catalogue lists
+#   • no fragment, no click-tracking parameters (utm_*, fbclid, …), the
+#     remaining parameters sorted
+# Anything a site might use to identify content is only touched when
+# the paper's 'canonical' entry says so:
+#   'drop_params': [...]  more parameter patterns to drop (e.g. 'ref')
+#   'amp': True           AMP variants (an /amp path segment, .amp
+#                         suffix, ?amp=1, outputType=amp) fold onto the
+#                         article itself
+#   'https': True         http links are upgraded to https
+# On top of these rules, each fetched article's <link rel="canonical">
+# teaches a mapping (our URL → the one the site declares), kept across
+# cycles, so the next cycle schedules the declared URL straight away.
+# A declared URL that is the site root, one of the paper's listings, or
+# claimed by a second article is a CMS default, not the story: it is
+# never learned (and the first claim is forgotten).
+
+CANON_MEMO_SIZE   = 50000
+CANON_LEARNED_MAX = 20000
+
+_TRACKING_PARAMS = frozenset((
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', '_ga',
+    'ref_src', 'ref_url', 'cmpid', 'ito', 's_cid', 'ncid',
+))
+_HOST_PREFIXES = ('www.', 'm.', 'amp.', 'mobile.')
+
+def _bare_host(host):
+    host = (host or '').lower().rstrip('.')
+    for p in _HOST_PREFIXES:
+        if host.startswith(p):
+            return host[len(p):]
+    return host
+
+def _canon_hosts():
+    """bare host → the host the catalogue uses for it."""
+    out = {}
+    for info in NEWSPAPERS.values():
+        for u in [info['url']] + info.get('sections', []):
+            host = urlsplit(u).hostname
+            out.setdefault(_bare_host(host), host)
+    return out
+
+CANON_HOSTS = _canon_hosts()
+
+def _drop_param(name, value, rules):
+    n = name.lower()
+    if n in _TRACKING_PARAMS or n.startswith('utm_'):
+        return True
+    if rules.get('amp') and (n == 'amp' or n == 'outputtype' and value.lower() == 'amp'):
+        return True
+    return any(fnmatch.fnmatchcase(n, pat) for pat in rules.get('drop_params', ()))
+
+_CANON_MEMO    = _LRU(CANON_MEMO_SIZE)       # raw url → canonical (rules only)
+_CANON_LEARNED = _LRU(CANON_LEARNED_MAX)     # canonical → page's declared canonical
+_CANON_CLAIMS  = _LRU(CANON_LEARNED_MAX)     # declared canonical → the URL learned onto it
+_CANON_SHARED  = _LRU(CANON_LEARNED_MAX)     # declared by several articles → True
+_LISTINGS      = None                        # canonical url / sections / feeds of every paper
+
+def _canonical(url):
+    """Rule-based canonical form of an absolute URL (memoised)."""
+    hit = _CANON_MEMO.get(url)
+    if hit is not None:
+        return hit
+    try:
+        parts = urlsplit(url)
+        port  = parts.port
+    except ValueError:
+        return url
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url
+    host = CANON_HOSTS.get(_bare_host(parts.hostname), parts.hostname.lower())
+    key    = _paper_for_url(f'https://{host}/')
+    rules  = NEWSPAPERS[key].get('canonical', {}) if key else {}
+    scheme = 'https' if rules.get('https') else parts.scheme
+    if port and port not in (80, 443):
+        host = f'{host}:{port}'
+
+    path = parts.path or '/'
+    if rules.get('amp'):
+        path = '/'.join(s for s in path.split('/') if s.lower() != 'amp') or '/'
+        if path.endswith('.amp'):
+            path = path[:-4]
+        if parts.path.endswith('/') and not path.endswith('/'):
+            path += '/'
+
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _drop_param(k, v, rules)))
+
+    out = urlunsplit((scheme, host, path, query, ''))
+    _CANON_MEMO.put(url, out)
+    return out
+
+def canon_url(url):
+    """Canonical URL, including mappings learned from rel=canonical."""
+    url = _canonical(url)
+    return _CANON_LEARNED.get(url, url)
+
+def _listing_urls():
+    global _LISTINGS
+    if _LISTINGS is None:
+        _LISTINGS = {_canonical(u) for info in NEWSPAPERS.values()
+                     for u in [info['url']] + info.get('sections', []) + info.get('feeds', [])}
+    return _LISTINGS
+
+def _remember_canonical(url, declared):
+    """Learn url → declared unless declared is a listing rather than a story."""
+    if (urlsplit(declared).path in ('', '/') or declared in _listing_urls()
+            or _CANON_SHARED.get(declared)):
+        return False
+    first = _CANON_CLAIMS.get(declared)
+    if first is not None and first != url:     # two articles, one "canonical"
+        _CANON_SHARED.put(declared, True)
+        _CANON_LEARNED.pop(first)
+        return False
+    _CANON_CLAIMS.put(declared, url)
+    _CANON_LEARNED.put(url, declared)
+    return True
+
+def _learn_canonical(url, soup):
+    """The URL the page declares for itself (same paper only), remembered."""
+    link = soup.find('link', rel='canonical', href=True)
+    if link is None:
+        return url
+    declared = _canonical(urljoin(url, link['href'].strip()))
+    if declared == url or _paper_for_url(declared) != _paper_for_url(url):
+        return url
+    return declared if _remember_canonical(url, declared) else url
+
+# ════════════════════════════════════════════════════════════════════
+# HEADLINE CLASSIFIER
+# ════════════════════════════════════════════════════════════════════
+
+TAMIL_RE = re.compile(r'[\u0B80-\u0BFF]')
+
+def _looks_like_headline(text, href):
+    if not text or not href:                          return False
+    if len(text) < 18 or len(text) > 400:            return False
+    if len(TAMIL_RE.findall(text)) < 3:              return False
+    tl = text.lower()
+    if any(w in tl for w in NAV_WORDS):              return False
+    if any(g.lower() in tl for g in GENERIC_SKIP):   return False
+    if re.search(r'20\d{2}.*பார்வை', text):        return False
+    return True
+
+# ════════════════════════════════════════════════════════════════════
+# TIMESTAMP  EXTRACTION  (per-site learned recipes)
+# ════════════════════════════════════════════════════════════════════
+# A recipe is (source, parser): where on the page the date lives and
+# which fast parser reads it.  The first recipe that works for a paper
+# is remembered in _TS_RECIPES and tried first on its next article, so
+# a typical page costs one find() and one regex.  dateutil's fuzzy
+# parser only runs when every precompiled path has failed.  Only a
+# precompiled parser that gave a full date-time is remembered: a date
+# from the URL, fuzzy dateutil or a bare date never jumps the queue, and
+# a remembered recipe that yields only a date falls back to the search.
+#
+# Every publish time is a naive datetime in IST, whatever zone the
+# server runs in: explicit UTC offsets (feeds, ISO meta tags) are
+# converted, and times without one are taken as the publisher's IST
+# wall clock.
+
+PUBLISH_TZ = timezone(timedelta(hours=5, minutes=30))   # IST
+
+_TS_CLASS_RE = re.compile(r'time|date|publish|posted|ago', re.I)
+
+_EN_MONTHS = {m: i for i, m in enumerate(
+    ('jan','feb','mar','apr','may','jun','jul','aug','sep','oct','nov','dec'), 1)}
+_TAMIL_MONTHS = {
+    'ஜனவரி': 1, 'பிப்ரவரி': 2, 'மார்ச்': 3, 'ஏப்ரல்': 4, 'மே': 5, 'ஜூன்': 6,
+    'ஜூலை': 7, 'ஆகஸ்ட்': 8, 'ஆகஸ்டு': 8, 'செப்டம்பர்': 9, 'அக்டோபர்': 10,
+    'நவம்பர்': 11, 'டிசம்பர்': 12,
+}
+_MONTH = r'([A-Za-z]{3,9}|' + '|'.join(sorted(_TAMIL_MONTHS, key=len, reverse=True)) + r')'
+
+_DMY_NAME_RE = re.compile(r'(\d{1,2})(?:st|nd|rd|th)?\s+' + _MONTH + r'\.?,?\s+(\d{4})')
+_MDY_NAME_RE = re.compile(_MONTH + r'\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})')
+_DMY_NUM_RE  = re.compile(r'\b(\d{1,2})[/.\-](\d{1,2})[/.\-](\d{4})\b')
+_ISO_RE      = re.compile(r'(\d{4})[/\-](\d{1,2})[/\-](\d{1,2})'
+                          r'(?:[T ](\d{1,2}):(\d{2})(?::(\d{2}))?)?')
+_OFFSET_RE   = re.compile(r'(?:\.\d+)?\s*(Z|[+-]\d{2}:?\d{2})\b')
+_TIME_RE     = re.compile(r'(\d{1,2})[:.](\d{2})(?::(\d{2}))?\s*([AaPp])?\.?[Mm]?')
+_REL_RE      = re.compile(
+    r'(\d+)\s*(வினாடி|நிமிட|மணி|நாள|நாட்|sec|min|hour|hr|day)[\u0B80-\u0BFF\w\s]*?(?:முன்|ago)', re.I)
+_REL_UNITS   = {'வினாடி': 'seconds', 'sec': 'seconds', 'நிமிட': 'minutes', 'min': 'minutes',
+                'மணி': 'hours', 'hour': 'hours', 'hr': 'hours',
+                'நாள': 'days', 'நாட்': 'days', 'day': 'days'}
+
+_TS_RECIPES = {}              # sourceKey → (source, parser) that last worked
+_TS_UNLEARNED = ('url', 'dateutil')   # never tried first: too coarse / too slow
+
+def _ist(dt):
+    """Aware → naive IST; naive is already IST wall time."""
+    if dt is not None and dt.tzinfo is not None:
+        dt = dt.astimezone(PUBLISH_TZ).replace(tzinfo=None)
+    return dt
+
+def _now_ist():
+    return datetime.now(PUBLISH_TZ).replace(tzinfo=None)
+
+def _month_num(name):
+    return _TAMIL_MONTHS.get(name) or _EN_MONTHS.get(name[:3].lower())
+
+def _sane(dt):
+    """Guard against misparses (phone numbers, page ids) being learned."""
+    return dt if dt and 2000 <= dt.year <= datetime.now().year + 1 else None
+
+def _with_time(txt, pos, y, mo, d):
+    t = _TIME_RE.search(txt, pos)
+    h = mi = sec = 0
+    if t:
+        h, mi, sec = int(t.group(1)), int(t.group(2)), int(t.group(3) or 0)
+        ampm = (t.group(4) or '').lower()
+        if ampm == 'p' and h < 12: h += 12
+        if ampm == 'a' and h == 12: h = 0
+    try:
+        return datetime(y, mo, d, h, mi, sec)
+    except ValueError:
+        try:    return datetime(y, mo, d)
+        except ValueError: return None
+
+def _parse_dt(s):
+    """ISO-8601 / y-m-d; a UTC offset right after the time is honoured."""
+    m = _ISO_RE.search(s or '')
+    if not m: return None
+    y, mo, d, h, mi, sec = (int(g) if g else 0 for g in m.groups())
+    try:    dt = datetime(y, mo, d, h, mi, sec)
+    except ValueError: return None
+    off = m.group(4) and _OFFSET_RE.match(s, m.end())
+    if off:
+        z = off.group(1).replace(':', '')
+        delta = 0 if z == 'Z' else (1 if z[0] == '+' else -1) * (int(z[1:3]) * 60 + int(z[3:5]))
+        dt = _ist(dt.replace(tzinfo=timezone(timedelta(minutes=delta))))
+    return dt
+
+def _parse_dmy_name(s):
+    m = _DMY_NAME_RE.search(s)
+    mo = m and _month_num(m.group(2))
+    return _with_time(s, m.end(), int(m.group(3)), mo, int(m.group(1))) if mo else None
+
+def _parse_mdy_name(s):
+    m = _MDY_NAME_RE.search(s)
+    mo = m and _month_num(m.group(1))
+    return _with_time(s, m.end(), int(m.group(3)), mo, int(m.group(2))) if mo else None
+
+def _parse_dmy_num(s):
+    m = _DMY_NUM_RE.search(s)
+    if not m: return None
+    return _with_time(s, m.end(), int(m.group(3)), int(m.group(2)), int(m.group(1)))
+
+def _parse_relative(s):
+    """'15 நிமிடங்களுக்கு முன்', '2 மணி நேரத்துக்கு முன்', '3 hours ago'."""
+    m = _REL_RE.search(s)
+    if not m: return None
+    unit = _REL_UNITS.get(m.group(2)) or _REL_UNITS[m.group(2).lower()]
+    return _now_ist() - timedelta(**{unit: int(m.group(1))})
+
+def _parse_dateutil(s):
+    if not date_parser: return None
+    try:    return _ist(date_parser.parse(s, fuzzy=True))
+    except (ValueError, OverflowError): return None
+
+_TS_PARSERS = {
+    'iso':      _parse_dt,
+    'dmy_name': _parse_dmy_name,
+    'mdy_name': _parse_mdy_name,
+    'dmy_num':  _parse_dmy_num,
+    'relative': _parse_relative,
+    'dateutil': _parse_dateutil,      # last resort – slow
+}
+
+def _ts_from_profile(soup, url, key):
+    sel = _site_selector(key, 'timestamp')
+    el  = sel.select_one(soup) if sel else None
+    if el is None: return None
+    return el.get('datetime') or el.get('content') or el.get_text(' ', strip=True)
+
+def _ts_from_meta(soup, url, key):
+    meta = soup.find('meta', {'property': 'article:published_time'})
+    return meta.get('content') if meta else None
+
+def _ts_from_time(soup, url, key):
+    tag = soup.find('time', {'datetime': True})
+    return tag['datetime'] if tag else None
+
+def _ts_from_class(name):
+    def find(soup, url, key):
+        el = soup.find(name, {'class': _TS_CLASS_RE})
+        return el.get_text(' ', strip=True) if el else None
+    return find
+
+def _ts_from_url(soup, url, key):
+    return url
+
+# source → (text finder, parsers worth trying on that text, in order)
+_TS_SOURCES = {
+    'profile': (_ts_from_profile,   ('iso', 'dmy_name', 'mdy_name', 'dmy_num', 'relative', 'dateutil')),
+    'meta': (_ts_from_meta,         ('iso', 'dateutil')),
+    'time': (_ts_from_time,         ('iso', 'dateutil')),
+    'span': (_ts_from_class('span'), ('iso', 'dmy_name', 'mdy_name', 'dmy_num', 'relative', 'dateutil')),
+    'div':  (_ts_from_class('div'),  ('iso', 'dmy_name', 'mdy_name', 'dmy_num', 'relative', 'dateutil')),
+    'p':    (_ts_from_class('p'),    ('iso', 'dmy_name', 'mdy_name', 'dmy_num', 'relative', 'dateutil')),
+    'url':  (_ts_from_url,          ('iso',)),
+}
+
+def _has_time(dt):
+    return (dt.hour, dt.minute, dt.second) != (0, 0, 0)
+
+def _try_recipe(soup, url, key, source, parser):
+    txt = _TS_SOURCES[source][0](soup, url, key)
+    return _sane(_TS_PARSERS[parser](txt)) if txt else None
+
+def extract_timestamp(soup, url, key=None):
+    learned = _TS_RECIPES.get(key)
+    if learned:
+        ts = _try_recipe(soup, url, key, *learned)
+        if ts and _has_time(ts): return ts
+    # full search: every source in priority order, cheap parsers first
+    # and dateutil only after all precompiled paths on every source
+    texts = {}                  # source → text, looked up lazily
+    for last_resort in (False, True):
+        for source, (find, parsers) in _TS_SOURCES.items():
+            if source not in texts:
+                texts[source] = find(soup, url, key)
+            txt = texts[source]
+            if not txt: continue
+            for parser in parsers:
+                if (parser == 'dateutil') != last_resort: continue
+                ts = _sane(_TS_PARSERS[parser](txt))
+                if ts:
+                    if key and _has_time(ts) and not {source, parser} & set(_TS_UNLEARNED):
+                        _TS_RECIPES[key] = (source, parser)
+                    return ts
+    return None
+
+# ════════════════════════════════════════════════════════════════════
+# CONTENT  EXTRACTION
+# ════════════════════════════════════════════════════════════════════
+
+_CONTENT_JUNK = ['subscribe','follow us','share this','advertisement','login',
+                 'register','copyright','all rights','also read',
+                 'சந்தா','பகிரவும்','விளம்பரம்','இதையும் படியுங்கள்','மேலும் படிக்க']
+
+def extract_content(soup, key=None):
+    sel = _site_selector(key, 'body')
+    if sel:                                   # targeted lookup, no tree cleanup
+        body = _join_paragraphs(sel.select(soup))
+        if body: return body
+    for tag in soup.find_all(['script','style','nav','header','footer',
+                              'iframe','aside','form','noscript']):
+        tag.decompose()
+    container = (
+        soup.find('article') or
+        soup.find('div', class_=re.compile(
+            r'article-body|story-body|post-content|news-body|'
+            r'article-content|entry-content|article-text|'
+            r'content-area|main-content|news-detail|StoryContent', re.I)) or
+        soup.find('div', id=re.compile(r'article|story|content|detail', re.I))
+    )
+    paras = container.find_all(['p','div']) if container else soup.find_all('p')
+    return _join_paragraphs(paras)
+
+def _join_paragraphs(paras):
+    texts, seen = [], set()
+    for p in paras:
+        t = p.get_text(strip=True)
+        if len(t) < 25: continue
+        if any(j in t.lower() for j in _CONTENT_JUNK): continue
+        short = t[:80]
+        if short in seen: continue
+        seen.add(short); texts.append(t)
+    body = '\n\n'.join(texts)
+    return body if len(body) >= 50 else None    # lowered from 200 to 50
+
+# ════════════════════════════════════════════════════════════════════
+# CYCLE PROFILER  (opt-in sampling profiler for one full_scrape)
+# ════════════════════════════════════════════════════════════════════
+# Armed for the next cycle by POST /api/profile, or for every cycle by
+# TAMIL_NEWS_PROFILE=1.  A sampler thread snapshots every tagged worker
+# stack each few ms; stacks are rooted at "<paper>;<pass>" so a single
+# flamegraph splits cleanly by newspaper and by pass-1 / pass-2.
+
+PROFILE_EVERY    = os.environ.get('TAMIL_NEWS_PROFILE', '') == '1'
+PROFILE_INTERVAL = 0.005      # seconds between samples
+PROFILE_TOP_N    = 25
+PROFILE_KEEP     = 20         # newest N cycles kept in profiles/
+
+_PROFILE_TAGS = {}            # thread ident → 'paper;pass'
+_PROFILE_SEQ  = count(1)      # keeps stamps unique within one second
+
+@contextmanager
+def _profile_tag(tag):
+    """Label this thread for the profiler; the previous label comes back after."""
+    ident = threading.get_ident()
+    prev  = _PROFILE_TAGS.get(ident)
+    _PROFILE_TAGS[ident] = tag
+    try:
+        yield
+    finally:
+        if prev is None:
+            _PROFILE_TAGS.pop(ident, None)
+        else:
+            _PROFILE_TAGS[ident] = prev
+
+def _tagged(tag, fn, *args):
+    """Run fn(*args) with this worker thread labelled for the profiler."""
+    with _profile_tag(tag):
+        return fn(*args)
+
+_TAGGED_CODE = _tagged.__code__    # stacks are cut here: thread-pool frames are noise
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class _SamplingProfiler:
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks   = Counter()       # folded stack → samples
+        self.samples  = 0
+        self._stop    = threading.Event()
+        self._thread  = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                tag = _PROFILE_TAGS.get(ident)
+                if ident == me or tag is None: continue
+                names = []
+                while frame is not None and frame.f_code is not _TAGGED_CODE:
+                    names.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                names.append(tag)
+                self.stacks[';'.join(reversed(names))] += 1
+                self.samples += 1
+
+    def summary(self, top_n=PROFILE_TOP_N):
+        """Top-N functions by self and inclusive samples, plus per-tag totals."""
+        own, incl, tags = Counter(), Counter(), Counter()
+        for stack, n in self.stacks.items():
+            parts = stack.split(';')
+            tags[';'.join(parts[:2])] += n
+            own[parts[-1]] += n
+            for name in set(parts[2:]):
+                incl[name] += n
+        total = self.samples or 1
+        lines = [f"samples: {self.samples}  (every {self.interval*1000:.0f} ms)", "",
+                 "── by paper / pass ──"]
+        lines += [f"{n*100/total:6.1f}%  {t}" for t, n in tags.most_common()]
+        lines += ["", f"── top {top_n} self ──"]
+        lines += [f"{n*100/total:6.1f}%  {f}" for f, n in own.most_common(top_n)]
+        lines += ["", f"── top {top_n} inclusive ──"]
+        lines += [f"{n*100/total:6.1f}%  {f}" for f, n in incl.most_common(top_n)]
+        return '\n'.join(lines) + '\n'
+
+def _profile_requested():
+    with STATE_LOCK:
+        armed, STATE['profile_next'] = STATE['profile_next'], False
+    return _take_request('profile') or armed or PROFILE_EVERY
+
+def _save_profile(prof):
+    """Write <stamp>.folded (flamegraph.pl / speedscope) and <stamp>.txt."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{next(_PROFILE_SEQ)}"
+    with open(os.path.join(PROFILE_DIR, stamp + '.folded'), 'w', encoding='utf-8') as f:
+        for stack, n in prof.stacks.most_common():
+            f.write(f"{stack} {n}\n")
+    with open(os.path.join(PROFILE_DIR, stamp + '.txt'), 'w', encoding='utf-8') as f:
+        f.write(prof.summary())
+    for old in _list_profiles()[PROFILE_KEEP:]:
+        for ext in ('.folded', '.txt'):
+            try:  os.remove(os.path.join(PROFILE_DIR, old + ext))
+            except OSError: pass
+    _set_state(last_profile=stamp)
+    _log(f"🔬 Profile saved → profiles/{stamp}.folded ({prof.samples} samples)")
+
+def _list_profiles():
+    """Stamps of saved profiles, newest first."""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except OSError:
+        return []
+    return sorted({n[:-7] for n in names if n.endswith('.folded')}, reverse=True)
+
+# ════════════════════════════════════════════════════════════════════
+# ARTICLE RECORD
+# ════════════════════════════════════════════════════════════════════
+# Articles live as slotted records for the whole cycle and only become
+# JSON dicts once, at the very end of full_scrape.  The three source
+# strings are shared per newspaper instead of copied into every article.
+
+PASS2_LIMIT     = 50          # ranking window: best N pass-1 headlines per paper
+PASS2_MIN       = 20          # always fetch at least this many of the window …
+PASS2_BUDGET_S  = 90          # … and stop starting new fetches after this long
+# eager → fetch the top PASS2_LIMIT and keep their content previews
+# rank  → fetch only the top articles that still lack a publish time;
+#         previews come from /api/article when the reader expands one
+# off   → no article fetches at all; rank on pass-1 signals only
+PASS2_MODE  = os.environ.get('TAMIL_NEWS_PASS2', 'eager')
+# every scraped article also goes into the full-text index (tamil_news/search.py)
+SEARCH_INDEX = os.environ.get('TAMIL_NEWS_SEARCH', '1') != '0'
+# every published feed is also appended to the daily archive (tamil_news/history.py)
+HISTORY_ARCHIVE = os.environ.get('TAMIL_NEWS_HISTORY', '1') != '0'
+
+# One pass-1 result: hot = anchor sits in a breaking/trending block,
+# pos = where it sits on its own page or feed (0.0 = top, towards 1.0 = bottom)
+Headline = namedtuple('Headline', 'title url ts hot pos', defaults=(None, False, 0.0))
+
+class _PaperMeta:
+    __slots__ = ('key', 'tamil', 'english')
+
+    def __init__(self, key, info):
+        self.key     = sys.intern(key)
+        self.tamil   = sys.intern(info['tamil'])
+        self.english = sys.intern(info['english'])
+
+PAPER_META = {k: _PaperMeta(k, v) for k, v in NEWSPAPERS.items()}
+
+class Article:
+    __slots__ = ('paper', 'title', 'url', 'content', 'ts', 'trending_score', 'buzz')
+
+    def __init__(self, paper, title, url, content='', ts=None, trending_score=0):
+        self.paper          = paper          # shared _PaperMeta
+        self.title          = title
+        self.url            = url
+        self.content        = content
+        self.ts             = ts             # datetime | None
+        self.trending_score = trending_score # this paper's own signals
+        self.buzz           = 0              # cross-paper velocity, set at merge
+
+    def to_dict(self, number):
+        """The JSON shape the dashboard consumes."""
+        ts, score = self.ts, self.trending_score + self.buzz
+        return {
+            'source':         self.paper.tamil,
+            'sourceEn':       self.paper.english,
+            'sourceKey':      self.paper.key,
+            'title':          self.title,
+            'content':        self.content,
+            'url':            self.url,
+            'timestamp':      ts.isoformat() if ts else None,
+            'trending_score': score,
+            'buzz':           self.buzz,
+            'published_time': ts.strftime('%I:%M %p, %b %d') if ts else None,
+            'number':         number,
+            'is_trending':    score > 0,
+        }
+
+# ════════════════════════════════════════════════════════════════════
+# FETCH CONCURRENCY  (per-host AIMD limits)
+# ════════════════════════════════════════════════════════════════════
+# Every request goes through its host's limiter.  The limit grows by
+# about one slot per window of healthy responses (additive increase)
+# and halves on a timeout, connection error, 429 or 503, or when recent
+# latency climbs past a multiple of the host's long-run latency (a fast
+# vs. a slow moving average, so big and small pages mix freely) –
+# at most once per latency period, so one burst of failures counts
+# once.  Pass 2 keeps up to AIMD_MAX pages in flight and leaves the
+# gating to each article host's own limiter; the current limits are
+# reported through /api/status.
+
+AIMD_START     = 4            # slots per host before any feedback
+AIMD_MIN       = 1
+AIMD_MAX       = 16
+AIMD_SLOW      = 3.0          # recent latency > this × long-run latency → back off
+_THROTTLED     = {429, 503}
+
+class _HostLimiter:
+    __slots__ = ('limit', 'inflight', 'ewma', 'base', 'requests', 'errors',
+                 'last_cut', '_cond')
+
+    def __init__(self):
+        self.limit    = float(AIMD_START)
+        self.inflight = 0
+        self.ewma     = None          # seconds, recent (fast average)
+        self.base     = None          # seconds, long run (slow average)
+        self.requests = 0
+        self.errors   = 0
+        self.last_cut = 0.0
+        self._cond    = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.inflight >= int(self.limit):
+                self._cond.wait()
+            self.inflight += 1
+
+    def release(self, seconds, healthy):
+        with self._cond:
+            self.inflight -= 1
+            self.requests += 1
+            now = time.time()
+            if healthy:
+                self.ewma = seconds if self.ewma is None else 0.7 * self.ewma + 0.3 * seconds
+                self.base = seconds if self.base is None else 0.95 * self.base + 0.05 * seconds
+                slow = self.ewma > AIMD_SLOW * max(self.base, 0.05)
+            else:
+                self.errors += 1
+                slow = True
+            if slow:
+                if now - self.last_cut > (self.ewma or 1.0):
+                    self.limit    = max(AIMD_MIN, self.limit / 2)
+                    self.last_cut = now
+            else:
+                self.limit = min(AIMD_MAX, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def stats(self):
+        return {'limit': int(self.limit), 'inflight': self.inflight,
+                'latency_ms': round(self.ewma * 1000) if self.ewma else None,
+                'requests': self.requests, 'errors': self.errors}
+
+_LIMITERS      = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def _limiter(url):
+    host = (urlsplit(url).hostname or '').lower()
+    with _LIMITERS_LOCK:
+        lim = _LIMITERS.get(host)
+        if lim is None:
+            lim = _LIMITERS[host] = _HostLimiter()
+        return lim
+
+def fetch_limits():
+    """host → {'limit', 'inflight', 'latency_ms', 'requests', 'errors'}."""
+    with _LIMITERS_LOCK:
+        return {h: lim.stats() for h, lim in sorted(_LIMITERS.items())}
+
+def _http_get(url, **kwargs):
+    """requests.get under the host's limit; feeds the outcome back to it.
+
+    With stream=True the slot is held only until the headers arrive.
+    """
+    import requests
+    lim = _limiter(url)
+    lim.acquire()
+    t0, healthy = time.time(), False
+    try:
+        r = requests.get(url, timeout=16, **kwargs)
+        healthy = r.status_code not in _THROTTLED and r.status_code < 500
+        return r
+    finally:
+        lim.release(time.time() - t0, healthy)
+
+# ════════════════════════════════════════════════════════════════════
+# FEEDS  (RSS / Atom / news-sitemap  → cheap pass 1)
+# ════════════════════════════════════════════════════════════════════
+# A few KB of XML give title + URL + publish time for every story, so
+# when a paper's 'feeds' yield enough items its heavy homepage and
+# section pages are not downloaded at all.  The XML is parsed while it
+# streams in and each item is cleared once read.
+
+FEED_MIN_ITEMS = 20           # fewer than this → also scrape the HTML pages
+
+def _xml_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+def _feed_time(txt):
+    """RFC-822 (RSS) or ISO-8601 (Atom / sitemap) → naive IST datetime."""
+    if not txt: return None
+    txt = txt.strip()
+    try:
+        dt = parsedate_to_datetime(txt)
+    except (TypeError, ValueError, IndexError):
+        dt = None
+    if dt is None:
+        m = _ISO_RE.search(txt)
+        if not m: return None
+        try:    dt = datetime.fromisoformat(txt.replace('Z', '+00:00'))
+        except ValueError: return _parse_dt(txt)
+    return _sane(_ist(dt))
+
+def _feed_item(elem):
+    """(title, url, timestamp) from an RSS <item>, Atom <entry> or sitemap <url>."""
+    title = link = when = None
+    for child in elem.iter():
+        name = _xml_name(child.tag)
+        text = (child.text or '').strip()
+        if name == 'title' and not title:
+            title = text
+        elif name == 'link' and not link:
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate': link = href
+            elif text: link = text
+        elif name in ('loc', 'guid') and not link and text.startswith('http'):
+            link = text
+        elif name in ('pubDate', 'published', 'publication_date', 'updated',
+                      'lastmod', 'date') and not when:
+            when = _feed_time(text)
+    title = ' '.join(html.unescape(title or '').split())
+    return title, link, when
+
+def _fetch_feed(url):
+    """Stream-parse one feed; list of (title, url, timestamp)."""
+    try:
+        r = _http_get(url, headers=_headers(), stream=True)
+    except Exception:
+        return []
+    with r:                         # hands the streamed connection back to the pool
+        if r.status_code != 200:
+            return []
+        return _feed_headlines(r.iter_content(16384), url)
+
+def _feed_headlines(chunks, url):
+    """Headlines from an iterable of feed bytes, parsed as they arrive."""
+    out = []
+    try:
+        parser = ET.XMLPullParser(events=('end',))
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _event, elem in parser.read_events():
+                if _xml_name(elem.tag) in ('item', 'entry', 'url'):
+                    title, link, when = _feed_item(elem)
+                    if link and _looks_like_headline(title, link):
+                        out.append(Headline(title, _canonical(urljoin(url, link.strip())), when))
+                    elem.clear()
+    except Exception:
+        pass                                  # truncated / not XML: keep what we got
+    return out
+
+# ════════════════════════════════════════════════════════════════════
+# PER-NEWSPAPER  TWO-PASS SCRAPER
+# ════════════════════════════════════════════════════════════════════
+
+def _fetch_body(url):
+    try:
+        # aggressive cache-busting to ensure truly fresh content
+        headers = _headers()
+        headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
+        headers['Pragma'] = 'no-cache'
+        headers['Expires'] = '0'
+        r = _http_get(url, headers=headers)
+        if r.status_code == 200:
+            return r.content
+    except:
+        pass
+    return None
+
+def _fetch_page(url):
+    body = _fetch_body(url)
+    return _soup(body) if body is not None else None
+
+# ── pass-1 memos ───────────────────────────────────────────────────
+# An unchanged homepage (same body hash) reuses last cycle's headlines
+# without being parsed.  A changed one still skips re-classifying the
+# anchors it shares with earlier cycles – nav, footer and evergreen
+# links repeat every time – via the (text, href, page) memo.
+PAGE_MEMO_SIZE   = 128
+ANCHOR_MEMO_SIZE = 20000
+
+_PAGE_MEMO   = _LRU(PAGE_MEMO_SIZE)      # (page url, body hash) → [Headline]
+_ANCHOR_MEMO = _LRU(ANCHOR_MEMO_SIZE)    # (text, href, page url) → (title, full) | None
+_MISS        = object()
+
+# pass-2 memo: article page → what pass 2 took from it.  Entries older
+# than FETCHED_TTL_S are fetched again, so live / updated stories pick
+# up new previews and breaking markers.
+FETCHED_MEMO_SIZE = 5000
+FETCHED_TTL_S     = 45 * 60     # three background cycles
+_FETCHED     = _LRU(FETCHED_MEMO_SIZE)   # url → (preview | None, publish time, page bonus, fetched epoch)
+
+def _page_headlines(url, key):
+    """Fetch one homepage / section and return its Headlines, memoised."""
+    body = _fetch_body(url)
+    if body is None:
+        return []
+    memo_key = (url, hashlib.blake2b(body, digest_size=16).digest())
+    out = _PAGE_MEMO.get(memo_key)
+    if out is None:
+        out = _collect_headlines(_soup(body), url, key)
+        _PAGE_MEMO.put(memo_key, out)
+    return out
+
+def _headline_anchors(soup, key):
+    """Anchors to classify: the site profile's nodes, else every <a href>."""
+    sel = _site_selector(key, 'headlines')
+    if sel:
+        anchors = []
+        for el in sel.select(soup):
+            if el.name == 'a':
+                if el.get('href'): anchors.append(el)
+            else:
+                anchors.extend(el.find_all('a', href=True))
+        if anchors:
+            return anchors
+    return soup.find_all('a', href=True)
+
+def _collect_headlines(soup, base_url, key=None):
+    seen, out = set(), []
+    for a in _headline_anchors(soup, key):
+        href  = a['href'].strip()
+        if not href or href.startswith('#') or href.startswith('javascript:'): continue
+        text  = a.get_text(strip=True)
+        hit   = _ANCHOR_MEMO.get((text, href, base_url), _MISS)
+        if hit is _MISS:
+            title = ' '.join(text.split())
+            hit   = (title, _abs_url(base_url, href)) if _looks_like_headline(title, href) else None
+            _ANCHOR_MEMO.put((text, href, base_url), hit)
+        if hit is None: continue
+        title, full = hit
+        if full in seen: continue
+        seen.add(full)
+        hot   = a.find_parent(class_=_HOT_RE) is not None
+        out.append(Headline(title, full, None, hot))   # homepages carry no publish time
+    return out
+
+def _preview(content):
+    """Cap extracted content at ~200 words for display."""
+    if content:
+        words = content.split()
+        if len(words) > 200:
+            content = ' '.join(words[:200]) + '…'
+    return content
+
+def _title_score(title):
+    return sum(25 for w in ENGAGEMENT_WORDS if w in title)
+
+_HOT_RE = re.compile(r'trending|popular|featured|breaking|top-story', re.I)
+
+def _prescore(h):
+    """Cheap pass-1 guess at trending: title words, hot block, page position."""
+    return _title_score(h.title) + (120 if h.hot else 0) + 40 * (1 - h.pos)
+
+def _visit_count(window):
+    """Adaptive pass-2 size: the promising headlines plus a PASS2_MIN floor."""
+    promising = sum(1 for h in window if h.hot or _title_score(h.title))
+    return min(len(window), PASS2_MIN + promising)
+
+def scrape_one_newspaper(key, info):
+    _log(f"  🔍 {info['english']} – fetching …")
+    t0 = time.time()
+    raw = scrape_pass1(key, info)
+    if not raw:
+        return []
+    articles, fetched = scrape_pass2(key, info, raw)
+    elapsed = time.time() - t0
+    PAPER_SCRAPED[key] = time.time()
+    KNOWN_URLS[key] = {a.url for a in articles}
+    LAST_CYCLE['papers'][key] = {'headlines': len(raw), 'articles': len(articles),
+                                 'fetched': fetched, 'seconds': round(elapsed, 2)}
+    _log(f"    ✅ {info['english']}: {len(articles)} articles ({sum(1 for a in articles if a.content)} with content) in {elapsed:.1f}s")
+    return articles
+
+def scrape_pass1(key, info):
+    """Headlines of one paper, in page order."""
+    # PASS 1 – feeds first; homepage + sections only when the feeds are
+    # missing or thin (parallel fetch).  raw = [(title, url, ts|None)]
+    # Each source is added whole and in a fixed order (not as fetches
+    # finish), with positions taken on its own page, so the pass-2
+    # window is the same whatever the network timing.
+    raw, seen_urls = [], set()
+    def _add(items):
+        n = len(items)
+        for i, h in enumerate(items):
+            url = _CANON_LEARNED.get(h.url, h.url)    # memoised lists predate what we learned
+            if url not in seen_urls:
+                seen_urls.add(url)
+                raw.append(h._replace(url=url, pos=i / n))
+
+    feeds = info.get('feeds', [])
+    if feeds:
+        with ThreadPoolExecutor(max_workers=len(feeds)) as pool:   # host limits gate the requests
+            for items in pool.map(lambda u: _tagged(f'{key};pass1', _fetch_feed, u), feeds):
+                _add(items)
+
+    if len(raw) < FEED_MIN_ITEMS:
+        pages = [info['url']] + info.get('sections', [])
+        with ThreadPoolExecutor(max_workers=len(pages)) as pool:
+            futs = [pool.submit(_tagged, f'{key};pass1', _page_headlines, u, key) for u in pages]
+            for f in futs:                                # homepage first, then sections
+                _add(f.result())
+
+    _log(f"    {info['english']}: {len(raw)} headlines (pass-1)")
+    if not raw:
+        _log(f"    ⚠️  {info['english']}: zero headlines")
+    return raw
+
+def scrape_pass2(key, info, raw):
+    """(articles, pages fetched) for one paper's pass-1 headlines."""
+    # PASS 2 – the PASS2_LIMIT best headlines by pre-score form the
+    # ranking window.  They are fetched best-first from a priority heap
+    # (content + timestamp), stopping at the adaptive visit count or the
+    # time budget; outside eager mode fewer or none are fetched.
+    meta     = PAPER_META[key]
+    articles = []
+    prio     = {h.url: _prescore(h) for h in raw}
+    window   = heapq.nlargest(PASS2_LIMIT, raw, key=lambda h: prio[h.url])
+    in_window = {h.url for h in window}
+    if PASS2_MODE == 'off':
+        candidates = []
+    elif PASS2_MODE == 'rank':
+        candidates = [h for h in window if h.ts is None]
+    else:
+        candidates = window
+    keep_content = PASS2_MODE == 'eager'
+    visited      = set()
+
+    # pages fetched recently (this run or before a restart) are reused
+    # until FETCHED_TTL_S; the title part of the score is always fresh
+    now = time.time()
+    for h in candidates:
+        hit = _FETCHED.get(h.url)
+        if hit is None or now - hit[3] > FETCHED_TTL_S or (keep_content and hit[0] is None):
+            continue
+        content, ts, bonus, _when = hit
+        visited.add(h.url)
+        articles.append(Article(meta, h.title, h.url, (content or '') if keep_content else '',
+                                h.ts or ts, _title_score(h.title) + bonus))
+    candidates = [h for h in candidates if h.url not in visited]
+
+    # memo hits count towards the visit budget: a warm cycle fetches only
+    # what a cold one would have fetched beyond them
+    limit        = min(len(candidates), max(0, _visit_count(window) - len(visited)))
+    heap         = [(-prio[h.url], i, h) for i, h in enumerate(candidates)]
+    heapq.heapify(heap)
+    deadline     = time.time() + PASS2_BUDGET_S
+    fetched      = 0
+
+    with _profile_tag(f'{key};pass2'):     # parsing below runs on this thread
+        with ThreadPoolExecutor(max_workers=AIMD_MAX) as pool:
+            inflight = {}
+            while heap or inflight:
+                # _http_get waits for a slot on the article's own host
+                while (heap and len(inflight) < AIMD_MAX and fetched < limit
+                       and time.time() < deadline):
+                    *_prio, h = heapq.heappop(heap)
+                    visited.add(h.url)
+                    fetched += 1
+                    inflight[pool.submit(_tagged, f'{key};pass2', _fetch_page, h.url)] = h
+                if not inflight:
+                    break
+                done, _pending = wait(inflight, return_when=FIRST_COMPLETED)
+                for f in done:
+                    title, seen_url, ts, *_ = inflight.pop(f)
+                    asoup          = f.result()
+                    content, score = None, 0
+                    url            = seen_url
+                    if asoup:
+                        url     = _learn_canonical(seen_url, asoup)
+                        ts      = ts or extract_timestamp(asoup, url, key)   # feed time wins
+                        if keep_content:
+                            content = _preview(extract_content(asoup, key))
+                        # trending score = title words + the page's own markers
+                        bonus = 0
+                        if asoup.find(class_=_HOT_RE):
+                            bonus += 120
+                        if asoup.find(string=re.compile(r'breaking|முக்கியம்|விரைவு', re.I)):
+                            bonus += 100
+                        score = _title_score(title) + bonus
+                        memo  = (content, ts, bonus, time.time())
+                        _FETCHED.put(url, memo)
+                        if url != seen_url:
+                            _FETCHED.put(seen_url, memo)
+
+                    articles.append(Article(meta, title, url, content or '', ts, score))
+
+    # window headlines we chose not to fetch: rank on the title alone
+    articles.extend(Article(meta, h.title, h.url, ts=h.ts, trending_score=_title_score(h.title))
+                    for h in window if h.url not in visited)
+
+    # add remaining headlines as headline-only entries (page order)
+    articles.extend(Article(meta, h.title, h.url, ts=h.ts)
+                    for h in raw if h.url not in in_window)
+
+    if SEARCH_INDEX:
+        try:
+            from tamil_news import search
+            search.index_articles(key, articles)
+        except Exception as e:
+            _log(f"    ⚠️  {info['english']}: search index error: {e}")
+    return articles, fetched
+
+# ════════════════════════════════════════════════════════════════════
+# ARTICLE CONTENT ON DEMAND   (GET /api/article?url=…)
+# ════════════════════════════════════════════════════════════════════
+# Previews the scrape did not keep are fetched the first time a reader
+# expands them, then served from a bounded LRU.  Concurrent requests
+# for one URL share a single fetch.  Only catalogue hosts are fetched,
+# so the endpoint is not an open proxy.
+
+ARTICLE_CACHE_SIZE = 2000
+
+_ARTICLE_CACHE = OrderedDict()    # url → {'content', 'timestamp'}
+_ARTICLE_INFLIGHT = {}            # url → Future
+_ARTICLE_LOCK  = threading.Lock()
+
+def _host_key(host):
+    host = (host or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+def _paper_hosts():
+    """host → newspaper key, from every catalogue URL."""
+    out = {}
+    for key, info in NEWSPAPERS.items():
+        for u in [info['url']] + info.get('sections', []) + info.get('feeds', []):
+            out.setdefault(_host_key(urlsplit(u).hostname), key)
+    return out
+
+PAPER_HOSTS = _paper_hosts()
+
+def _paper_for_url(url):
+    """Catalogue key owning url (host or any subdomain), else None."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme not in ('http', 'https'):
+        return None
+    host = _host_key(parts.hostname)
+    while host:
+        if host in PAPER_HOSTS: return PAPER_HOSTS[host]
+        host = host.partition('.')[2]
+    return None
+
+def _load_article(url, key):
+    soup = _fetch_page(url)
+    if soup is None:
+        return None
+    ts = extract_timestamp(soup, url, key)
+    return {'content':   _preview(extract_content(soup, key)) or '',
+            'timestamp': ts.isoformat() if ts else None}
+
+def get_article(url, key):
+    """Cached, coalesced article fetch; None when the page can't be loaded."""
+    with _ARTICLE_LOCK:
+        hit = _ARTICLE_CACHE.get(url)
+        if hit is not None:
+            _ARTICLE_CACHE.move_to_end(url)
+            return hit
+        fut = _ARTICLE_INFLIGHT.get(url)
+        owner = fut is None
+        if owner:
+            fut = _ARTICLE_INFLIGHT[url] = Future()
+    if not owner:
+        return fut.result()
+    try:
+        art = _load_article(url, key)
+    except Exception:
+        art = None
+    if art and SEARCH_INDEX:                 # a search-DB problem never fails the fetch
+        try:
+            from tamil_news import search
+            search.index_content(url, art['content'])
+        except Exception as e:
+            _log(f"    ⚠️  search index error ({url}): {e}")
+    with _ARTICLE_LOCK:
+        del _ARTICLE_INFLIGHT[url]
+        if art is not None:
+            _ARTICLE_CACHE[url] = art
+            while len(_ARTICLE_CACHE) > ARTICLE_CACHE_SIZE:
+                _ARTICLE_CACHE.popitem(last=False)
+    fut.set_result(art)
+    return art
+
+# ════════════════════════════════════════════════════════════════════
+# RANKING  (one columnar, stable multi-key sort for the whole feed)
+# ════════════════════════════════════════════════════════════════════
+# Sort keys are computed once per article into typed arrays; a ranking
+# picks which columns to sort by (most significant first).  NumPy's
+# lexsort does it in one call when installed, otherwise one C-level
+# list.sort per column, least significant first (sorts are stable).
+#
+#   grouped  → [all Dinamalar, all Daily Thanthi, …] in catalogue
+#              priority; trending first (score desc) then newest
+#   trending → trending first across every paper, then newest
+#   latest   → newest first across every paper
+
+RANKINGS = {
+    'grouped':  lambda c: (c['paper'], c['cold'], c['neg_score'], c['neg_ts']),
+    'trending': lambda c: (c['cold'], c['neg_score'], c['neg_ts']),
+    'latest':   lambda c: (c['neg_ts'],),
+}
+RANKING = os.environ.get('TAMIL_NEWS_RANKING', 'grouped')
+
+def _rank_columns(articles, paper_order):
+    pos = {k: i for i, k in enumerate(paper_order)}
+    paper, cold = array('l'), array('b')
+    neg_score, neg_ts = array('d'), array('d')
+    for a in articles:
+        paper.append(pos[a.paper.key])
+        score = a.trending_score + a.buzz
+        cold.append(score <= 0)
+        neg_score.append(-score)
+        neg_ts.append(-a.ts.timestamp() if a.ts else 0.0)
+    return {'paper': paper, 'cold': cold, 'neg_score': neg_score, 'neg_ts': neg_ts}
+
+def rank_articles(articles, paper_order, ranking=None):
+    """Indices into articles, in feed order."""
+    if not articles:
+        return []
+    keys = RANKINGS.get(ranking or RANKING, RANKINGS['grouped'])(
+        _rank_columns(articles, paper_order))
+    try:
+        import numpy as np          # optional, and only needed once a cycle ranks
+    except ImportError:
+        np = None
+    if np is not None:
+        return np.lexsort([np.asarray(k) for k in reversed(keys)]).tolist()
+    order = list(range(len(articles)))
+    for k in reversed(keys):
+        order.sort(key=k.__getitem__)
+    return order
+
+# ════════════════════════════════════════════════════════════════════
+# CROSS-PAPER TRENDING  (sliding-window velocity counters)
+# ════════════════════════════════════════════════════════════════════
+# A story is trending when more papers start covering it, faster than
+# its terms usually appear.  Each title becomes a set of terms: words
+# of 3+ letters, minus stopwords, cut to their first TREND_STEM code
+# points so Tamil case endings (சென்னையில், சென்னைக்கு → சென்னை)
+# count as one.  For every article URL not counted before, each
+# (paper, term) pair adds 1 to the current time bucket's count-min
+# sketch, at most once per bucket, so a count reads "paper-mentions".
+#
+# The window is TREND_BUCKETS sketches of TREND_BUCKET_S each, kept in
+# a ring plus one running total.  A term's velocity is its count in the
+# last TREND_RECENT buckets minus what the rest of the window predicts
+# for that span; an article's buzz is the mean velocity of its two best
+# terms.  Memory is fixed (about 600 KB) however many terms go by, a
+# cycle costs O(new articles) updates, and the sketch survives
+# restarts through warm_cache.json.
+
+TREND_BUCKET_S   = 10 * 60    # one sketch per 10 minutes …
+TREND_BUCKETS    = 18         # … over a 3-hour window
+TREND_RECENT     = 3          # the last 30 minutes are "now"
+TREND_MIN_PAPERS = 3          # recent paper-mentions before a term can trend
+TREND_WEIGHT     = 30         # buzz points per unit of velocity …
+TREND_CAP        = 150        # … capped, so it lifts but never swamps the paper's own score
+TREND_STEM       = 6          # code points kept per term
+TREND_SEEN_SIZE  = 20000      # URLs remembered as already counted
+CMS_DEPTH, CMS_WIDTH = 4, 2048
+
+_TERM_RE = re.compile(r'[0-9A-Za-z\u0B80-\u0BFF]+')
+TREND_STOPWORDS = frozenset([
+    'இந்த','அந்த','ஒரு','மற்றும்','என்று','என','அவர்','அவரது','இது','அது',
+    'பற்றி','மீது','உள்ள','உள்ளது','செய்தி','செய்திகள்','இன்று','நேற்று',
+    'நாளை','புதிய','பேர்','மேலும்','வரை','போது','பின்','முன்','தான்',
+    'the','and','for','with','from','that','this','are','was','has','have',
+    'will','after','over','into','its','his','her','news','live','updates',
+    'update','video','photos','watch','says','said','new','today',
+])
+
+def _trend_terms(title):
+    """Distinct stemmed terms of a headline."""
+    from tamil_news.search import normalise
+    words = _TERM_RE.findall(normalise(title).lower())
+    return {w[:TREND_STEM] for w in words
+            if len(w) >= 3 and not w.isdigit() and w not in TREND_STOPWORDS}
+
+class _TrendSketch:
+    """Ring of count-min sketches over time buckets, plus their running sum."""
+    def __init__(self):
+        cells = CMS_DEPTH * CMS_WIDTH
+        self.buckets = [array('I', bytes(4 * cells)) for _ in range(TREND_BUCKETS)]
+        self.total   = array('I', bytes(4 * cells))
+        self.epoch   = None       # absolute number of the newest bucket
+        self.filled  = 0          # buckets of history so far (≤ TREND_BUCKETS)
+        self.pairs   = set()      # (paper, term) already counted in the newest bucket
+        self.seen    = _LRU(TREND_SEEN_SIZE)
+        self.hot     = []         # [(term, velocity)] of the last score(), best first
+        self._lock   = threading.Lock()
+
+    @staticmethod
+    def _cells(term):
+        h = hashlib.blake2b(term.encode(), digest_size=8).digest()
+        h1, h2 = int.from_bytes(h[:4], 'little'), int.from_bytes(h[4:], 'little') | 1
+        return [i * CMS_WIDTH + (h1 + i * h2) % CMS_WIDTH for i in range(CMS_DEPTH)]
+
+    def _advance(self, now):
+        b = int(now // TREND_BUCKET_S)
+        if self.epoch is None:
+            self.epoch, self.filled = b, 1
+            return
+        if b <= self.epoch:
+            return
+        total = self.total
+        for n in range(self.epoch + 1, self.epoch + 1 + min(b - self.epoch, TREND_BUCKETS)):
+            old = self.buckets[n % TREND_BUCKETS]
+            if any(old):
+                for i, c in enumerate(old):
+                    if c:
+                        total[i] -= c
+                self.buckets[n % TREND_BUCKETS] = array('I', bytes(4 * len(old)))
+        self.filled = min(TREND_BUCKETS, self.filled + b - self.epoch)
+        self.epoch  = b
+        self.pairs.clear()
+
+    def observe(self, articles):
+        """Count the articles whose URL this sketch has not seen yet."""
+        with self._lock:
+            self._advance(time.time())
+            cur, total, added = self.buckets[self.epoch % TREND_BUCKETS], self.total, 0
+            for a in articles:
+                if self.seen.get(a.url):
+                    continue
+                self.seen.put(a.url, True)
+                added += 1
+                for term in _trend_terms(a.title):
+                    pair = (a.paper.key, term)
+                    if pair in self.pairs:
+                        continue
+                    self.pairs.add(pair)
+                    for i in self._cells(term):
+                        cur[i] += 1
+                        total[i] += 1
+            return added
+
+    def velocity(self, term):
+        """(recent paper-mentions, velocity) of one term."""
+        idx = self._cells(term)
+        recent = [self.buckets[(self.epoch - k) % TREND_BUCKETS]
+                  for k in range(min(TREND_RECENT, self.filled))]
+        r = min(sum(b[i] for b in recent) for i in idx)
+        past = min(self.total[i] for i in idx) - r
+        span = self.filled - len(recent)
+        expected = max(0, past) * TREND_RECENT / span if span > 0 else 0.0
+        return r, r - expected
+
+    def score(self, articles):
+        """Set each article's buzz from its two fastest-rising terms."""
+        memo = {}
+        with self._lock:
+            if self.epoch is None:
+                return
+            self._advance(time.time())
+            for a in articles:
+                best = []
+                for term in _trend_terms(a.title):
+                    if term not in memo:
+                        r, v = self.velocity(term)
+                        memo[term] = v if r >= TREND_MIN_PAPERS and v > 0 else 0.0
+                    best.append(memo[term])
+                top = heapq.nlargest(2, best) + [0.0, 0.0]
+                buzz = TREND_WEIGHT * (top[0] + top[1]) / 2
+                a.buzz = min(TREND_CAP, int(buzz)) if buzz >= TREND_WEIGHT else 0
+        self.hot = heapq.nlargest(10, ((t, round(v, 1)) for t, v in memo.items() if v),
+                                  key=lambda tv: tv[1])
+
+    # ── warm_cache.json round trip ──────────────────────────────────
+    def dump(self):
+        with self._lock:
+            if self.epoch is None:
+                return None
+            return {
+                'epoch':   self.epoch,
+                'filled':  self.filled,
+                'buckets': [base64.b64encode(zlib.compress(b.tobytes())).decode()
+                            for b in self.buckets],
+                'seen':    [u for u, _ in self.seen.items()],
+            }
+
+    def load(self, d):
+        if not isinstance(d, dict) or len(d.get('buckets', ())) != TREND_BUCKETS:
+            return
+        buckets = []
+        for blob in d['buckets']:
+            b = array('I')
+            b.frombytes(zlib.decompress(base64.b64decode(blob)))
+            if len(b) != CMS_DEPTH * CMS_WIDTH:
+                return                         # saved with other dimensions
+            buckets.append(b)
+        total = array('I', bytes(4 * CMS_DEPTH * CMS_WIDTH))
+        for b in buckets:
+            for i, c in enumerate(b):
+                if c:
+                    total[i] += c
+        with self._lock:
+            self.buckets, self.total = buckets, total
+            self.epoch, self.filled  = d['epoch'], d['filled']
+            self.pairs.clear()
+            for u in d.get('seen', []):
+                self.seen.put(u, True)
+
+TRENDS = _TrendSketch()
+
+# ════════════════════════════════════════════════════════════════════
+# FULL SCRAPE  (reads saved selection every time)
+# ════════════════════════════════════════════════════════════════════
+
+def _results(futures):
+    for f in futures:
+        try:
+            yield f.result()
+        except Exception as e: _log(f"    ❌ thread error: {e}")
+
+def merge_articles(batches, paper_order, ranking=None):
+    """Dedup, rank and number per-paper article lists into the feed."""
+    # ── collect and dedup in one streaming pass ──────────────────
+    # Dedup by URL, then by similar title (first 55 normalised chars);
+    # survivors are kept once, so no intermediate raw / unique /
+    # deduped copies are built.
+    kept = []
+    seen_urls, seen_titles = set(), set()
+    for batch in batches:
+        for a in batch:
+            if a.url in seen_urls: continue
+            seen_urls.add(a.url)
+            norm = ' '.join(a.title.lower().split())[:55]
+            if norm in seen_titles: continue
+            seen_titles.add(norm)
+            kept.append(a)
+
+    # ── cross-paper velocity (new URLs counted, everything re-scored) ─
+    TRENDS.observe(kept)
+    TRENDS.score(kept)
+
+    # ── rank (default: grouped by newspaper in priority order) ───
+    order = rank_articles(kept, paper_order, ranking)
+
+    # ── number & flag (the only dict materialisation) ────────────
+    return [kept[j].to_dict(i) for i, j in enumerate(order, 1)]
+
+# timing of the most recent cycle – filled by _full_scrape and
+# scrape_one_newspaper, printed by the headless CLI
+LAST_CYCLE = {'started': None, 'seconds': 0.0, 'articles': 0, 'trending': 0, 'papers': {}}
+PAPER_SCRAPED = {}            # key → epoch of its last completed scrape
+KNOWN_URLS    = {}            # key → URLs of its last scrape (change probes diff against it)
+
+def full_scrape(papers=None, reuse=None):
+    """One scrape cycle; runs under the sampling profiler when armed.
+
+    papers – catalogue keys to scrape; default is the saved selection.
+    reuse  – {key: [Article]} merged in as-is instead of scraping key.
+    """
+    prof = _SamplingProfiler().start() if _profile_requested() else None
+    try:
+        return (_tagged('cycle;merge', _full_scrape, papers, reuse) if prof
+                else _full_scrape(papers, reuse))
+    finally:
+        if prof:
+            prof.stop()
+            _save_profile(prof)
+
+def _full_scrape(papers=None, reuse=None):
+    # ── read current selection from disk (unless given) ──────────
+    selected = papers or _read_selection()
+    reuse    = {k: v for k, v in (reuse or {}).items() if k in selected}
+    # keep NEWSPAPERS insertion order but only selected keys
+    to_scrape = {k: NEWSPAPERS[k] for k in NEWSPAPERS if k in selected and k not in reuse}
+
+    _log("\n" + "="*70)
+    _log(f"🔴 SCRAPE STARTED  –  {datetime.now().strftime('%H:%M:%S')}")
+    _log(f"   Papers ({len(to_scrape)}): {', '.join(to_scrape[k]['english'] for k in to_scrape)}")
+    if reuse:
+        _log(f"   Reused ({len(reuse)}): {', '.join(NEWSPAPERS[k]['english'] for k in reuse)}")
+    _log("="*70)
+    t0 = time.time()
+    LAST_CYCLE.update(started=datetime.now(), papers={})
+
+    selected_keys = [k for k in NEWSPAPERS if k in selected]   # NEWSPAPERS insertion order
+    with ThreadPoolExecutor(max_workers=max(1, len(to_scrape))) as pool:   # one host each
+        futs = {pool.submit(_tagged, f'{k};pass1', scrape_one_newspaper, k, v): k
+                for k, v in to_scrape.items()}
+        ordered = merge_articles(chain(reuse.values(), _results(as_completed(futs))),
+                                 selected_keys)
+
+    trending_total = sum(1 for a in ordered if a['is_trending'])
+    elapsed = time.time() - t0
+    LAST_CYCLE.update(seconds=round(elapsed, 2), articles=len(ordered), trending=trending_total)
+    _set_state(fetch_limits=fetch_limits())
+    _log(f"\n✅ SCRAPE DONE – {len(ordered)} articles "
+         f"({trending_total} trending) grouped by {len(selected_keys)} newspapers "
+         f"in {elapsed:.0f}s  –  {datetime.now().strftime('%H:%M:%S')}")
+    if TRENDS.hot:
+        _log(f"   📈 Rising: {', '.join(f'{t} (+{v})' for t, v in TRENDS.hot[:5])}")
+    _log("="*70 + "\n")
+    return ordered
+
+# ════════════════════════════════════════════════════════════════════
+# WARM START  (restart without a cold, full first cycle)
+# ════════════════════════════════════════════════════════════════════
+# news_live.json keeps being served as-is while the collector boots.
+# warm_cache.json, written after every published cycle, holds when
+# each paper was last scraped plus the caches worth keeping: the pass-2
+# page memo, learned canonical URLs, on-demand previews and the
+# trending sketch.  On boot
+# only papers older than WARM_MAX_AGE_S are scraped; the others are
+# taken from the snapshot, so a restart costs a few requests, not a
+# full cycle of them.
+
+WARM_FILE      = os.path.join(BASE_DIR, 'warm_cache.json')
+WARM_MAX_AGE_S = 13 * 60      # same as the background cycle
+
+def _iso(ts):
+    return ts.isoformat() if ts else None
+
+def _from_iso(s):
+    try:
+        return datetime.fromisoformat(s) if s else None
+    except (TypeError, ValueError):
+        return None
+
+def _save_warm():
+    with _ARTICLE_LOCK:
+        previews = list(_ARTICLE_CACHE.items())
+    _write_json(WARM_FILE, {
+        'saved':     time.time(),
+        'papers':    PAPER_SCRAPED,
+        'fetched':   [[u, c, _iso(ts), b, at] for u, (c, ts, b, at) in _FETCHED.items()],
+        'canonical': _CANON_LEARNED.items(),
+        'previews':  previews,
+        'trends':    TRENDS.dump(),
+    })
+
+def _load_warm():
+    """Reload the persisted caches; {key: scraped epoch} ({} if none)."""
+    warm = _read_json(WARM_FILE)
+    if not isinstance(warm, dict):
+        return {}
+    for row in warm.get('fetched', []):
+        if len(row) == 5:                       # older files carry no fetch time: refetch
+            u, c, ts, bonus, at = row
+            _FETCHED.put(u, (c, _from_iso(ts), bonus, at))
+    for seen, declared in warm.get('canonical', []):
+        _remember_canonical(seen, declared)
+    with _ARTICLE_LOCK:
+        for u, art in warm.get('previews', [])[-ARTICLE_CACHE_SIZE:]:
+            _ARTICLE_CACHE[u] = art
+    TRENDS.load(warm.get('trends'))
+    return warm.get('papers', {})
+
+def _articles_from_snapshot(items):
+    """Snapshot dicts → {key: [Article]}, the inverse of Article.to_dict."""
+    out = {}
+    for d in items:
+        meta = PAPER_META.get(d.get('sourceKey'))
+        if meta is None:
+            continue
+        out.setdefault(meta.key, []).append(Article(
+            meta, d['title'], d['url'], d.get('content') or '',
+            _from_iso(d.get('timestamp')),
+            d.get('trending_score', 0) - d.get('buzz', 0)))   # buzz is re-scored
+    return out
+
+def _warm_start():
+    """({key: [Article]} still fresh enough to reuse, seconds until the oldest goes stale)."""
+    scraped = _load_warm()
+    snapshot = _articles_from_snapshot(_read_snapshot(LIVE_NEWS)) if scraped else {}
+    now, reuse, oldest = time.time(), {}, 0
+    for key, arts in snapshot.items():
+        age = now - scraped.get(key, 0)
+        if age < WARM_MAX_AGE_S:
+            reuse[key] = arts
+            PAPER_SCRAPED[key] = scraped[key]
+            KNOWN_URLS[key] = {a.url for a in arts}
+            oldest = max(oldest, age)
+    if snapshot:
+        _log(f"♨️  Warm start: snapshot has {len(snapshot)} papers, "
+             f"{len(reuse)} fresh enough to keep; {len(_FETCHED)} pages, "
+             f"{len(_CANON_LEARNED)} canonical URLs, {len(_ARTICLE_CACHE)} previews cached")
+    return reuse, WARM_MAX_AGE_S - oldest
+
+# ════════════════════════════════════════════════════════════════════
+# CHANGE PROBES   (breaking news between cycles)
+# ════════════════════════════════════════════════════════════════════
+# Every PROBE_INTERVAL_S each selected paper's cheapest listing – its
+# first feed, or its homepage if that fails – is re-requested with
+# If-None-Match / If-Modified-Since.  A 304 or an unchanged headline
+# fingerprint ends the probe there.  Otherwise only headlines missing
+# from the paper's last scrape go through pass 2, and the live snapshot
+# is re-published with them merged in; only then are they marked known.
+# Probes pause while a full cycle is running – the check and the probe's
+# publish share _LIVE_LOCK with the cycle's own live publish.
+# TAMIL_NEWS_PROBE=0 turns them off.
+
+PROBE_INTERVAL_S = int(os.environ.get('TAMIL_NEWS_PROBE', '60'))
+
+_PROBE_VALIDATORS = {}        # probe url → {'If-None-Match': …, 'If-Modified-Since': …}
+_PROBE_PRINTS     = {}        # probe url → fingerprint of its headline URL set
+_CYCLE_ACTIVE     = threading.Event()   # set from cycle start until its snapshot is live
+_LIVE_LOCK        = threading.Lock()    # held to flip _CYCLE_ACTIVE and to publish live
+
+def _probe_urls(info):
+    """Cheapest listing first: the first feed, then the homepage."""
+    return info.get('feeds', [])[:1] + [info['url']]
+
+def _probe_fetch(url):
+    """(status, body) of a conditional GET; validators remembered for next time."""
+    headers = {**_headers(), **_PROBE_VALIDATORS.get(url, {})}
+    try:
+        r = _http_get(url, headers=headers)
+    except Exception:
+        return None, None
+    if r.status_code == 200:
+        _PROBE_VALIDATORS[url] = {k: v for k, v in (('If-None-Match', r.headers.get('ETag')),
+                                                    ('If-Modified-Since', r.headers.get('Last-Modified')))
+                                  if v}
+    return r.status_code, r.content
+
+def _probe_paper(key):
+    """(new Articles since the paper's last scrape, what to record once published).
+
+    Returns None when there is nothing new.  The second item goes to
+    _probe_commit only after the articles are live, so a failed pass 2
+    or publish is retried on the next probe.
+    """
+    info  = NEWSPAPERS[key]
+    known = KNOWN_URLS.get(key)
+    if known is None:                          # never scraped in this process: nothing to diff
+        return None
+    for url in _probe_urls(info):
+        status, body = _probe_fetch(url)
+        if status == 304:                      # not modified
+            return None
+        if status == 200:
+            break
+    else:
+        return None                            # every listing failed
+    if url in info.get('feeds', []):
+        heads = _feed_headlines([body], url)
+    else:
+        heads = _collect_headlines(_soup(body), url, key)
+    print_ = hashlib.blake2b('\n'.join(sorted(h.url for h in heads)).encode(),
+                             digest_size=16).digest()
+    if _PROBE_PRINTS.get(url) == print_:
+        return None
+
+    new, urls = [], set()
+    for i, h in enumerate(heads):
+        u = _CANON_LEARNED.get(h.url, h.url)
+        if u not in known and u not in urls:
+            new.append(h._replace(url=u, pos=i / len(heads)))
+            urls.add(u)
+    if not new:
+        _PROBE_PRINTS[url] = print_
+        return None
+    articles, fetched = scrape_pass2(key, info, new)
+    _log(f"  ⚡ {info['english']}: {len(new)} new headlines ({fetched} fetched)")
+    return articles, (url, print_, urls)
+
+def _probe_commit(key, seen):
+    """Mark a probe's headlines known once its articles are live."""
+    url, print_, urls = seen
+    _PROBE_PRINTS[url] = print_
+    KNOWN_URLS.setdefault(key, set()).update(urls)
+
+def _probe_publish(found):
+    """Merge {key: [new Article]} into the live snapshot and publish it."""
+    current  = _articles_from_snapshot(_read_snapshot(LIVE_NEWS))
+    selected = set(_read_selection())
+    for key, arts in found.items():
+        current[key] = arts + current.get(key, [])
+    order = [k for k in NEWSPAPERS if k in current and k in selected]
+    data  = merge_articles((current[k] for k in order), order)
+    _publish_snapshot(LIVE_NEWS, data, precompress=True, archive=True)
+    _log(f"⚡ Probe: +{sum(map(len, found.values()))} articles "
+         f"({', '.join(NEWSPAPERS[k]['english'] for k in found)}) → news_live.json")
+
+def probe_loop():
+    _log(f"🛰️  Change probes every {PROBE_INTERVAL_S}s")
+    while True:
+        time.sleep(PROBE_INTERVAL_S)
+        if _CYCLE_ACTIVE.is_set():
+            continue
+        try:
+            keys = _read_selection()
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = dict(zip(keys, pool.map(
+                    lambda k: _tagged(f'{k};probe', _probe_paper, k), keys)))
+            results = {k: r for k, r in results.items() if r}
+            found   = {k: arts for k, (arts, _seen) in results.items() if arts}
+            with _LIVE_LOCK:
+                if _CYCLE_ACTIVE.is_set():     # the cycle's snapshot supersedes ours
+                    continue
+                if found:
+                    _probe_publish(found)
+            for key, (_arts, seen) in results.items():
+                _probe_commit(key, seen)
+        except Exception as e:
+            _log(f"❌ probe error: {e}")
+
+# ════════════════════════════════════════════════════════════════════
+# BACKGROUND LOOP   (server-owned 15-min cycle)
+# ════════════════════════════════════════════════════════════════════
+
+def background_loop():
+    _log("🟢 Background scrape loop started")
+    reuse, wait_s = _warm_start()
+    stale = [k for k in _read_selection() if k not in reuse]
+    if stale:
+        _log(f"📥 Initial scrape – {len(stale)} papers …")
+        data = full_scrape(reuse=reuse)    # reads selection
+        with _LIVE_LOCK:
+            _publish_snapshot(LIVE_NEWS, data, precompress=True, archive=True)
+        _save_warm()
+        _log("📥 news_live.json ready")
+        wait_s = 13 * 60
+    else:
+        _log("📥 news_live.json is current – nothing to scrape yet")
+    if PROBE_INTERVAL_S > 0:
+        threading.Thread(target=probe_loop, daemon=True).start()
+
+    while True:
+        _log(f"⏳ Sleeping {wait_s / 60:.0f} min …")
+        manual = _idle(wait_s)
+        wait_s = 13 * 60
+
+        with _LIVE_LOCK:                   # waits out a probe mid-publish
+            _CYCLE_ACTIVE.set()
+        _set_state(is_scraping=True)
+        _log("🔄 Refresh requested – background scrape …" if manual
+             else "🔄 13-min mark – background scrape …")
+        try:
+            data = full_scrape()           # re-reads selection every cycle
+            _publish_snapshot(TEMP_NEWS, data)
+            _log(f"📝 Wrote {len(data)} articles → news_temp.json")
+        except Exception as e:
+            _log(f"❌ background scrape error: {e}")
+            data = None
+        finally:
+            _set_state(is_scraping=False, last_scrape=datetime.now())
+
+        if not manual:                     # a reader asked: publish right away
+            _log("⏳ Sleeping 2 min …")
+            time.sleep(2 * 60)
+
+        with _LIVE_LOCK:
+            if data:
+                _publish_snapshot(LIVE_NEWS, data, precompress=True, archive=True)
+                _log("🔀 SWAPPED temp → live")
+            _CYCLE_ACTIVE.clear()
+        if data:
+            _save_warm()
+
+def _idle(seconds):
+    """Sleep; True if a web worker asked for a fresh scrape meanwhile."""
+    end = time.time() + seconds
+    while time.time() < end:
+        if _take_request('refresh'):
+            return True
+        time.sleep(max(0, min(5, end - time.time())))
+    return False
+
+# ─── JSON backend  (orjson → msgspec → stdlib) ──────────────────────
+# All encoding goes through _dumps (→ UTF-8 bytes) and all decoding
+# through _loads.  TAMIL_NEWS_JSON=orjson|msgspec|json forces a backend;
+# otherwise the fastest installed one wins.  datetimes encode natively
+# as ISO-8601 on every backend.
+
+def _json_default(o):
+    if isinstance(o, datetime): return o.isoformat()
+    return str(o)
+
+def _pick_json_backend():
+    wanted = os.environ.get('TAMIL_NEWS_JSON', '').lower()
+    available = [n for n, mod in (('orjson', orjson), ('msgspec', msgspec)) if mod]
+    if wanted in available or wanted == 'json':
+        return wanted
+    return available[0] if available else 'json'
+
+JSON_BACKEND = _pick_json_backend()
+
+if JSON_BACKEND == 'orjson':
+    def _dumps(obj):
+        return orjson.dumps(obj, default=_json_default)
+    _loads = orjson.loads
+elif JSON_BACKEND == 'msgspec':
+    _dumps = msgspec.json.Encoder(enc_hook=_json_default).encode
+    _loads = msgspec.json.decode
+else:
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
+    _loads = json.loads
+
+# ─── JSON helpers ───────────────────────────────────────────────────
+def _write_bytes(path, body):
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'   # one per writer
+    with open(tmp, 'wb') as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+def _lock_fd(f, blocking=True):
+    """Exclusive lock on an open file (first byte); OSError if taken and not blocking."""
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    elif msvcrt is not None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+
+_FILE_LOCKS = {}                    # path → threading.Lock (flock doesn't exclude threads)
+
+_COLLECTOR_LOCK = None              # open, locked .collector.pid while we are the collector
+
+def claim_collector():
+    """Become the only scraping process: None on success, else the holder's pid text.
+
+    The pid file stays locked for this process's lifetime, so a crashed
+    collector never leaves a stale claim behind.
+    """
+    global _COLLECTOR_LOCK
+    if _COLLECTOR_LOCK is not None:
+        return None
+    f = open(COLLECTOR_PID, 'a+')
+    try:
+        _lock_fd(f, blocking=False)
+    except OSError:
+        f.seek(0)
+        holder = f.read().strip() or '?'
+        f.close()
+        return holder
+    f.seek(0)
+    f.truncate()
+    f.write(str(os.getpid()))
+    f.flush()
+    _COLLECTOR_LOCK = f
+    return None
+
+@contextmanager
+def _file_lock(path):
+    """Hold <path>.lock across processes and threads, e.g. for a read-modify-write."""
+    with _FILE_LOCKS.setdefault(path, threading.Lock()):
+        with open(path + '.lock', 'a+') as f:
+            _lock_fd(f)             # released when f closes
+            yield
+
+def _write_json(path, data):
+    _write_bytes(path, _dumps(data))
+
+def _read_json(path):
+    try:
+        with open(path, 'rb') as f:
+            return _loads(f.read())
+    except:
+        return []
+
+# ─── snapshots  (news_live.json / news_temp.json) ───────────────────
+# A snapshot file IS the complete /api/news response body, so the live
+# feed is served straight off disk with send_file – no decode/encode
+# per request, whatever the article count.
+
+def _snapshot_body(data, mode='live'):
+    return {
+        'status':      'success',
+        'total_count': len(data),
+        'categories':  {'all_news': data},
+        'timestamp':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'mode':        mode,
+    }
+
+def _publish_snapshot(path, data, precompress=False, archive=False):
+    body = _dumps(_snapshot_body(data))
+    _write_bytes(path, body)
+    if precompress:                 # after the base file: variants never look newer than a stale one
+        _write_variants(path, body)
+    if archive and HISTORY_ARCHIVE:
+        try:
+            from tamil_news import history
+            n = history.append(data)
+            if n:
+                _log(f"🗄️  Archived {n} new headlines → history/")
+        except Exception as e:      # the live feed is already out; never fail the publish
+            _log(f"⚠️  history archive: {e}")
+
+def _read_snapshot(path):
+    """Article list of a snapshot (older files hold the bare list)."""
+    body = _read_json(path)
+    if isinstance(body, dict):
+        return body.get('categories', {}).get('all_news', [])
+    return body
+
+def _upgrade_snapshot(path):
+    """Rewrite a pre-snapshot bare-list file once, so it can be served as-is."""
+    if os.path.exists(path) and isinstance(_read_json(path), list):
+        _publish_snapshot(path, _read_snapshot(path), precompress=True)
+
+# ─── user views  (one user's slice of a snapshot) ──────────────────
+# A view is the snapshot body with only that user's papers, renumbered,
+# encoded once and kept with its ETag until the snapshot file or the
+# user's selection changes – every publish invalidates it by mtime, in
+# every web worker.  Compressed forms are built on first request.
+
+VIEW_CACHE_SIZE = 64
+_VIEWS = _LRU(VIEW_CACHE_SIZE)     # (path, user) → view
+
+class _View:
+    __slots__ = ('version', 'body', 'etag', 'variants')
+
+    def __init__(self, version, body):
+        self.version  = version
+        self.body     = body
+        self.etag     = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.variants = {}         # coding → compressed body
+
+    def encoded(self, coding):
+        if coding not in self.variants:
+            compress = {c: f for c, _ext, f in _encodings()}[coding]
+            self.variants[coding] = compress(self.body)
+        return self.variants[coding]
+
+def user_view(user, path=None):
+    """The cached _View of path (default news_live.json) for one user."""
+    path = path or LIVE_NEWS
+    keys = _read_selection(user)
+    try:
+        version = (os.stat(path).st_mtime_ns, tuple(keys))
+    except OSError:
+        version = (None, tuple(keys))
+    view = _VIEWS.get((path, user))
+    if view is not None and view.version == version:
+        return view
+    snap = _read_json(path)
+    if not isinstance(snap, dict):             # missing, or an old bare-list file
+        snap = {'categories': {'all_news': snap or []}}
+    wanted = set(keys)
+    data = [d for d in snap['categories'].get('all_news', []) if d.get('sourceKey') in wanted]
+    for i, d in enumerate(data, 1):
+        d['number'] = i
+    out = _snapshot_body(data)
+    if snap.get('timestamp'):
+        out['timestamp'] = snap['timestamp']   # when the shared snapshot was built
+    view = _View(version, _dumps(out))
+    _VIEWS.put((path, user), view)
+    return view
+
+# ─── precompressed variants  (<file>.br / <file>.gz) ────────────────
+# Compressed once per publish (snapshot) or per edit (dashboard HTML)
+# and picked by Accept-Encoding at request time.  A variant older than
+# its source is ignored, so a half-finished publish falls back to the
+# identity file instead of serving stale news.
+
+GZIP_LEVEL     = 9
+BROTLI_QUALITY = 11
+_VARIANT_LOCK  = threading.Lock()
+
+def _encodings():
+    out = [('gzip', '.gz', lambda b: gzip.compress(b, GZIP_LEVEL, mtime=0))]
+    if brotli is not None:
+        out.insert(0, ('br', '.br', lambda b: brotli.compress(b, quality=BROTLI_QUALITY)))
+    return out
+
+def _write_variants(path, body):
+    with _VARIANT_LOCK:
+        for _coding, ext, compress in _encodings():
+            _write_bytes(path + ext, compress(body))
+
+def _fresh_variant(path, ext):
+    try:
+        return os.stat(path + ext).st_mtime_ns >= os.stat(path).st_mtime_ns
+    except OSError:
+        return False
+
+def _ensure_variants(path):
+    """(Re)build compressed twins of a static file when it has changed."""
+    if all(_fresh_variant(path, ext) for _c, ext, _f in _encodings()):
+        return
+    with open(path, 'rb') as f:
+        _write_variants(path, f.read())
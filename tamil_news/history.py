@@ -0,0 +1,166 @@
+"""
+History archive
+===============
+news_live.json only ever holds the latest cycle.  Every published feed
+is also appended here, one partition per local day, so past headlines
+stay browsable for HISTORY_KEEP_DAYS (GET /api/history).
+
+    history/2026-10-19.jsonl.gz   gzip members, one per append
+    history/2026-10-19.idx        one JSON line per member:
+                                  [appended epoch, offset, length, rows, [papers]]
+
+Only articles not archived earlier that day (or the day before) are
+written, so a headline that stays live for hours is stored once.  Each
+append is a self-contained gzip member written at the end of the file
+– nothing is ever rewritten – and its index line goes in after it, so
+a crash mid-append leaves bytes the index never points at (trimmed on
+the next append).  Appends hold the collector's cross-process file lock
+on the day (POSIX or Windows), so the collector, shard mergers and CLI
+runs can all write to one archive; each first catches up on what the
+others appended.  A query opens only the days in range and decompresses
+only the members whose time and papers match, newest first, stopping at
+the limit.  No Flask here: the web server answers from query().
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from tamil_news.collector import _file_lock
+
+HISTORY_DIR       = os.environ.get('TAMIL_NEWS_HISTORY_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'history'))
+HISTORY_KEEP_DAYS = 365        # older partitions are deleted
+HISTORY_LIMIT     = 200        # default / max rows per query: 200 / 2000
+
+_LOCK = threading.Lock()       # the cycle and the change probes both append
+_SEEN = {}                     # day → [URLs archived that day, index entries read]
+
+def _day(dt):
+    return dt.strftime('%Y-%m-%d')
+
+def _paths(day):
+    base = os.path.join(HISTORY_DIR, day)
+    return base + '.jsonl.gz', base + '.idx'
+
+def _index(day):
+    """Index entries of one partition ([] if none); a torn last line is ignored."""
+    out = []
+    try:
+        with open(_paths(day)[1], 'rb') as f:
+            for line in f:
+                try:
+                    out.append(json.loads(line))
+                except ValueError:
+                    break
+    except OSError:
+        pass
+    return out
+
+def _members(day, entries):
+    """Decoded rows of the given index entries, one member at a time."""
+    with open(_paths(day)[0], 'rb') as f:
+        for t, off, length, _n, _papers in entries:
+            f.seek(off)
+            body = gzip.decompress(f.read(length))
+            yield t, [json.loads(line) for line in body.splitlines()]
+
+def _seen(day, entries=None):
+    """URLs archived on day, caught up with appends from other processes."""
+    entry = _SEEN.setdefault(day, [set(), 0])
+    entries = _index(day) if entries is None else entries
+    if len(entries) > entry[1]:
+        for _t, rows in _members(day, entries[entry[1]:]):
+            entry[0].update(r[3] for r in rows)
+        entry[1] = len(entries)
+    return entry[0]
+
+def append(data, now=None):
+    """Archive a published feed (the snapshot's article dicts).  Returns rows written."""
+    now = now or datetime.now()
+    today, yesterday = _day(now), _day(now - timedelta(days=1))
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    data_path, idx_path = _paths(today)
+    with _LOCK, _file_lock(data_path):     # <day>.jsonl.gz.lock, across processes
+        for day in list(_SEEN):
+            if day not in (today, yesterday):
+                del _SEEN[day]
+        with open(data_path, 'ab') as f:
+            entries = _index(today)
+            seen, old = _seen(today, entries), _seen(yesterday)
+            fresh, urls = [], set()
+            for a in data:
+                url = a.get('url')
+                if url and url not in seen and url not in old and url not in urls:
+                    urls.add(url)
+                    fresh.append(a)
+            if not fresh:
+                return 0
+
+            t = now.timestamp()
+            rows = [[a.get('sourceKey'), a.get('title'), a.get('timestamp'), a['url'],
+                     a.get('trending_score', 0)] for a in fresh]
+            member = gzip.compress(
+                '\n'.join(json.dumps(r, ensure_ascii=False) for r in rows).encode('utf-8'), mtime=0)
+            papers = sorted({r[0] for r in rows})
+
+            off = entries[-1][1] + entries[-1][2] if entries else 0
+            f.truncate(off)            # drop bytes of an append that never got indexed
+            f.write(member)
+            f.flush()
+            with open(idx_path, 'ab') as idx:
+                idx.write(json.dumps([t, off, len(member), len(rows), papers]).encode() + b'\n')
+            seen.update(urls)
+            _SEEN[today][1] = len(entries) + 1
+        if not entries:                # first append of the day
+            _prune(now)
+        return len(rows)
+
+def _prune(now):
+    cutoff = _day(now - timedelta(days=HISTORY_KEEP_DAYS))
+    for name in os.listdir(HISTORY_DIR):
+        if name[:10] < cutoff and name.endswith(('.jsonl.gz', '.idx', '.lock')):
+            os.remove(os.path.join(HISTORY_DIR, name))
+
+def _days():
+    try:
+        return sorted({n[:10] for n in os.listdir(HISTORY_DIR) if n.endswith('.idx')})
+    except OSError:
+        return []
+
+def query(since, until, papers=None, limit=HISTORY_LIMIT):
+    """Archived headlines first seen in [since, until), newest first.
+
+    papers – catalogue keys to restrict to.  Returns (rows, members read).
+    """
+    lo, hi = since.timestamp(), until.timestamp()
+    limit  = max(1, min(int(limit), 2000))
+    wanted = set(papers or ())
+    out, read = [], 0
+    for day in reversed(_days()):
+        if day > _day(until) or len(out) >= limit:
+            continue
+        if day < _day(since):
+            break
+        entries = [e for e in _index(day)
+                   if lo <= e[0] < hi and (not wanted or wanted.intersection(e[4]))]
+        for t, rows in _members(day, reversed(entries)):
+            read += 1
+            seen = datetime.fromtimestamp(t).isoformat()
+            for paper, title, ts, url, score in reversed(rows):
+                if wanted and paper not in wanted:
+                    continue
+                out.append({'url': url, 'sourceKey': paper, 'title': title,
+                            'timestamp': ts, 'first_seen': seen, 'trending_score': score})
+                if len(out) >= limit:
+                    return out, read
+    return out, read
+
+def stats():
+    days = _days()
+    rows = sum(e[3] for d in days for e in _index(d))
+    size = sum(os.path.getsize(os.path.join(HISTORY_DIR, n)) for n in os.listdir(HISTORY_DIR)) if days else 0
+    return {'days': len(days), 'rows': rows, 'bytes': size,
+            'oldest': days[0] if days else None}
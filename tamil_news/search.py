@@ -0,0 +1,197 @@
+"""
+Full-text search
+================
+Every article the scraper produces is upserted into a SQLite FTS5 index
+(search_index.db in the repo root, TAMIL_NEWS_SEARCH_DB to move it), so
+stories stay findable long after they leave news_live.json.
+
+Tamil is agglutinative – சென்னை, சென்னையில், சென்னைக்கு are one place –
+and FTS5's word tokenizer splits Tamil words at vowel signs, so the index
+uses the trigram tokenizer: any run of three or more code points matches
+inside a word (case-insensitively).  Text is NFC-normalised and
+stripped of zero-width joiners both when indexed and when queried.
+
+Rows are only re-indexed when their title or content changes; the same
+headline seen every cycle costs one primary-key lookup.  Times are
+stored as epochs; naive datetimes in and out are IST wall clock, like
+the collector's publish times.  No Flask here: the web server answers
+GET /api/search from search().
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from datetime import datetime
+
+from tamil_news.collector import PUBLISH_TZ
+
+SEARCH_DB        = os.environ.get('TAMIL_NEWS_SEARCH_DB', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'search_index.db'))
+SEARCH_KEEP_DAYS = 60          # older articles are dropped from the index
+SEARCH_LIMIT     = 50          # default / max results: 50 / 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id       INTEGER PRIMARY KEY,
+    url      TEXT    NOT NULL UNIQUE,
+    paper    TEXT    NOT NULL,
+    title    TEXT    NOT NULL,
+    content  TEXT    NOT NULL DEFAULT '',
+    ts       REAL,                          -- publish time (epoch), if known
+    seen     REAL    NOT NULL               -- first scraped (epoch)
+);
+CREATE INDEX IF NOT EXISTS articles_when ON articles (coalesce(ts, seen));
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, content, content='articles', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, content)
+    VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, content ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, content)
+    VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+
+# An article seen again is only touched when something indexable changed;
+# an empty content never overwrites a stored preview.
+_UPSERT = """
+INSERT INTO articles (url, paper, title, content, ts, seen) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET
+    title   = excluded.title,
+    content = CASE WHEN excluded.content != '' THEN excluded.content ELSE content END,
+    ts      = coalesce(ts, excluded.ts)
+WHERE title != excluded.title
+   OR (excluded.content != '' AND content != excluded.content)
+   OR (ts IS NULL AND excluded.ts IS NOT NULL)
+"""
+
+_LOCK       = threading.Lock()     # one connection per process, shared by scraper threads
+_DB         = None
+_last_prune = 0.0
+
+_INVISIBLE = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u00ad\ufeff'))
+_SPACE_RE  = re.compile(r'\s+')
+
+def normalise(text):
+    """NFC, no zero-width / soft-hyphen characters, single spaces."""
+    text = unicodedata.normalize('NFC', text or '').translate(_INVISIBLE)
+    return _SPACE_RE.sub(' ', text).strip()
+
+def _db():
+    global _DB
+    if _DB is None:
+        db = sqlite3.connect(SEARCH_DB, timeout=30, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.executescript(_SCHEMA)
+        _DB = db
+    return _DB
+
+def _epoch(ts):
+    """Epoch of a datetime; naive ones are IST."""
+    if not ts:
+        return None
+    return (ts.replace(tzinfo=PUBLISH_TZ) if ts.tzinfo is None else ts).timestamp()
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, PUBLISH_TZ).replace(tzinfo=None).isoformat() if epoch else None
+
+def index_articles(key, articles):
+    """Upsert one paper's articles (collector Article records)."""
+    now = time.time()
+    rows = [(a.url, key, normalise(a.title), normalise(a.content), _epoch(a.ts), now)
+            for a in articles]
+    with _LOCK:
+        db = _db()
+        with db:
+            db.executemany(_UPSERT, rows)
+            _prune(db, now)
+
+def index_content(url, content):
+    """Store a preview fetched on demand for an already indexed article."""
+    text = normalise(content)
+    if not text:
+        return
+    with _LOCK:
+        db = _db()
+        with db:
+            db.execute('UPDATE articles SET content = ? WHERE url = ? AND content != ?',
+                       (text, url, text))
+
+def _prune(db, now):
+    global _last_prune
+    if now - _last_prune < 3600:
+        return
+    _last_prune = now
+    db.execute('DELETE FROM articles WHERE coalesce(ts, seen) < ?',
+               (now - SEARCH_KEEP_DAYS * 86400,))
+
+def _fts_query(terms):
+    """Terms of 3+ code points as AND-ed phrases (trigrams can't index shorter)."""
+    return ' AND '.join('"' + t.replace('"', '""') + '"' for t in terms)
+
+def search(q, papers=None, since=None, until=None, limit=SEARCH_LIMIT, sort='relevance'):
+    """Matching articles, best (or newest) first.
+
+    q       – words, all required; each may match inside a longer word
+    papers  – catalogue keys to restrict to
+    since / until – datetimes bounding the publish (or first-seen) time;
+                    naive ones are IST
+    sort    – 'relevance' (bm25, title hits weigh 4×) or 'latest'
+    """
+    terms   = normalise(q).split()
+    long_t  = [t for t in terms if len(t) >= 3]
+    short_t = [t for t in terms if len(t) < 3]
+
+    where, args = [], []
+    if long_t:
+        where.append('articles_fts MATCH ?')
+        args.append(_fts_query(long_t))
+    for t in short_t:                                  # rare: scan, no index
+        where.append("(a.title LIKE ? ESCAPE '\\' OR a.content LIKE ? ESCAPE '\\')")
+        pat = '%' + t.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        args += [pat, pat]
+    if papers:
+        where.append(f"a.paper IN ({','.join('?' * len(papers))})")
+        args += list(papers)
+    if since:
+        where.append('coalesce(a.ts, a.seen) >= ?'); args.append(_epoch(since))
+    if until:
+        where.append('coalesce(a.ts, a.seen) < ?');  args.append(_epoch(until))
+
+    if long_t:
+        sql = """SELECT a.url, a.paper, a.title, a.ts, a.seen,
+                        snippet(articles_fts, -1, '[', ']', '…', 24)
+                 FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"""
+        order = ('bm25(articles_fts, 4.0, 1.0)' if sort == 'relevance'
+                 else 'coalesce(a.ts, a.seen) DESC')
+    else:
+        sql = """SELECT a.url, a.paper, a.title, a.ts, a.seen, substr(a.content, 1, 160)
+                 FROM articles a"""
+        order = 'coalesce(a.ts, a.seen) DESC'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += f' ORDER BY {order} LIMIT ?'
+    args.append(max(1, min(int(limit), 200)))
+
+    with _LOCK:
+        rows = _db().execute(sql, args).fetchall()
+    return [{'url': url, 'sourceKey': paper, 'title': title,
+             'timestamp': _iso(ts),
+             'first_seen': _iso(seen),
+             'snippet': snip or ''}
+            for url, paper, title, ts, seen, snip in rows]
+
+def stats():
+    with _LOCK:
+        n, oldest = _db().execute('SELECT COUNT(*), MIN(coalesce(ts, seen)) FROM articles').fetchone()
+    return {'articles': n,
+            'oldest': _iso(oldest)}
@@ -0,0 +1,298 @@
+"""
+Sharded scraping
+================
+A cycle is split into work units – one per (paper, pass) – on a shared
+queue.  Any number of collector processes, on one host or several
+sharing the queue file, claim units, run them and store the results;
+whichever worker finishes a cycle's last unit merges everything into
+one ranked snapshot.
+
+    python -m tamil_news enqueue --out news_live.json     # plan one cycle
+    python -m tamil_news work                              # on every node
+    python -m tamil_news merge                             # by hand, if needed
+
+The queue is a SQLite file (TAMIL_NEWS_QUEUE, default work_queue.db in
+the repo root) – a local stand-in for a real broker.  A claimed unit
+whose worker dies is handed out again after LEASE_S seconds; a unit
+that fails MAX_ATTEMPTS times counts as done with no results, so one
+broken site can't stall the cycle.
+"""
+
+import os
+import socket
+import sqlite3
+import time
+from datetime import datetime
+
+from tamil_news.collector import (
+    BASE_DIR, NEWSPAPERS, PAPER_META, Article, Headline, LIVE_NEWS,
+    _dumps, _loads, _log, _read_selection, _publish_snapshot,
+    scrape_pass1, scrape_pass2, merge_articles,
+)
+
+QUEUE_DB     = os.environ.get('TAMIL_NEWS_QUEUE', os.path.join(BASE_DIR, 'work_queue.db'))
+LEASE_S      = 300          # a claimed unit is re-issued after this long
+MAX_ATTEMPTS = 3
+KEEP_CYCLES  = 10           # older cycles (units + results) are pruned
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    created  REAL    NOT NULL,
+    papers   TEXT    NOT NULL,              -- JSON list, priority order
+    out      TEXT    NOT NULL,
+    merged   REAL                           -- set once, by the merging worker
+);
+CREATE TABLE IF NOT EXISTS units (
+    cycle    INTEGER NOT NULL,
+    paper    TEXT    NOT NULL,
+    pass     INTEGER NOT NULL,              -- 1 = headlines, 2 = articles
+    state    TEXT    NOT NULL DEFAULT 'todo',   -- todo | claimed | done
+    worker   TEXT,
+    claimed  REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    seconds  REAL,
+    result   BLOB,                          -- JSON rows, see _pack_*
+    PRIMARY KEY (cycle, paper, pass)
+);
+CREATE INDEX IF NOT EXISTS units_todo ON units (state, cycle);
+"""
+
+def _connect(path=None):
+    db = sqlite3.connect(path or QUEUE_DB, timeout=30, isolation_level=None)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA busy_timeout=30000')
+    db.executescript(_SCHEMA)
+    return db
+
+def _worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+# ─── result rows  (compact lists, not dicts) ───────────────────────
+def _iso(ts):
+    return ts.isoformat() if ts else None
+
+def _dt(s):
+    return datetime.fromisoformat(s) if s else None
+
+def _pack_headlines(raw):
+    return _dumps([[h.title, h.url, _iso(h.ts), h.hot, h.pos] for h in raw])
+
+def _unpack_headlines(body):
+    return [Headline(t, u, _dt(ts), *rest) for t, u, ts, *rest in _loads(body)]
+
+def _pack_articles(articles):
+    return _dumps([[a.title, a.url, a.content, _iso(a.ts), a.trending_score]
+                   for a in articles])
+
+def _unpack_articles(key, body):
+    meta = PAPER_META[key]
+    return [Article(meta, t, u, c, _dt(ts), score) for t, u, c, ts, score in _loads(body)]
+
+# ─── queue operations ──────────────────────────────────────────────
+def enqueue_cycle(papers=None, out=None, path=None):
+    """Plan one cycle: a pass-1 unit per paper.  Returns the cycle id."""
+    selected = papers or _read_selection()
+    keys = [k for k in NEWSPAPERS if k in selected]   # priority order
+    db = _connect(path)
+    try:
+        db.execute('BEGIN IMMEDIATE')
+        cur = db.execute('INSERT INTO cycles (created, papers, out) VALUES (?, ?, ?)',
+                         (time.time(), _dumps(keys), out or LIVE_NEWS))
+        cycle = cur.lastrowid
+        db.executemany('INSERT INTO units (cycle, paper, pass) VALUES (?, ?, 1)',
+                       [(cycle, k) for k in keys])
+        db.execute('COMMIT')
+    finally:
+        db.close()
+    _log(f"🗂️  Cycle {cycle} queued – {len(keys)} papers")
+    return cycle
+
+def _claim(db, worker):
+    """Next runnable unit (oldest cycle, pass 2 before pass 1) or None."""
+    now = time.time()
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        row = db.execute(
+            """SELECT cycle, paper, pass, attempts FROM units
+               WHERE state = 'todo' OR (state = 'claimed' AND claimed < ?)
+               ORDER BY cycle, pass DESC LIMIT 1""", (now - LEASE_S,)).fetchone()
+        if row is None:
+            db.execute('COMMIT')
+            return None
+        cycle, paper, pas, attempts = row
+        if attempts >= MAX_ATTEMPTS:          # give up on it – empty result
+            _finish(db, cycle, paper, pas, b'[]', 0.0)
+            db.execute('COMMIT')
+            _log(f"    ⚠️  {paper} pass {pas}: gave up after {attempts} attempts")
+            return _claim(db, worker)
+        db.execute("""UPDATE units SET state = 'claimed', worker = ?, claimed = ?,
+                      attempts = attempts + 1 WHERE cycle = ? AND paper = ? AND pass = ?""",
+                   (worker, now, cycle, paper, pas))
+        db.execute('COMMIT')
+        return cycle, paper, pas
+    except BaseException:
+        if db.in_transaction:
+            db.execute('ROLLBACK')
+        raise
+
+def _finish(db, cycle, paper, pas, body, seconds):
+    """Store a unit's result (inside the caller's transaction)."""
+    db.execute("""UPDATE units SET state = 'done', result = ?, seconds = ?
+                  WHERE cycle = ? AND paper = ? AND pass = ?""",
+               (body, seconds, cycle, paper, pas))
+    if pas == 1:
+        # pass 2 always follows so a cycle completes on pass-2 units alone
+        db.execute('INSERT OR IGNORE INTO units (cycle, paper, pass) VALUES (?, ?, 2)',
+                   (cycle, paper))
+
+def _run_unit(db, cycle, paper, pas):
+    info = NEWSPAPERS[paper]
+    t0 = time.time()
+    if pas == 1:
+        _log(f"  🔍 {info['english']} – pass 1 (cycle {cycle})")
+        body = _pack_headlines(scrape_pass1(paper, info))
+    else:
+        row = db.execute('SELECT result FROM units WHERE cycle = ? AND paper = ? AND pass = 1',
+                         (cycle, paper)).fetchone()
+        raw = _unpack_headlines(row[0]) if row and row[0] else []
+        articles, fetched = scrape_pass2(paper, info, raw) if raw else ([], 0)
+        _log(f"    ✅ {info['english']}: {len(articles)} articles, "
+             f"{fetched} pages fetched (cycle {cycle})")
+        body = _pack_articles(articles)
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        _finish(db, cycle, paper, pas, body, time.time() - t0)
+        db.execute('COMMIT')
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+
+def _complete(db, cycle):
+    """True when every paper's pass-2 unit of the cycle is done."""
+    papers = _loads(db.execute('SELECT papers FROM cycles WHERE id = ?', (cycle,)).fetchone()[0])
+    done = db.execute("""SELECT COUNT(*) FROM units
+                         WHERE cycle = ? AND pass = 2 AND state = 'done'""",
+                      (cycle,)).fetchone()[0]
+    return done == len(papers)
+
+def merge_cycle(cycle=None, path=None, force=False):
+    """Fold a finished cycle's results into one ranked snapshot.
+
+    Only one caller wins the merge of a cycle; returns the feed it
+    published, [] if every paper failed (the previous snapshot is kept),
+    or None (not finished, already merged, no such cycle).
+    force merges whatever results exist, finished or not.
+    """
+    db = _connect(path)
+    try:
+        if cycle is None:
+            row = db.execute('SELECT MAX(id) FROM cycles').fetchone()
+            cycle = row[0]
+        row = db.execute('SELECT papers, out, merged FROM cycles WHERE id = ?',
+                         (cycle,)).fetchone()
+        if row is None or (row[2] and not force):
+            return None
+        papers, out = _loads(row[0]), row[1]
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            won = (force or _complete(db, cycle)) and db.execute(
+                'UPDATE cycles SET merged = ? WHERE id = ?' + ('' if force else ' AND merged IS NULL'),
+                (time.time(), cycle)).rowcount
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        if not won:
+            return None
+
+        # merged doubles as the winner's claim; it is released again if
+        # the merge or publish fails, so the next worker retries it
+        try:
+            rows = db.execute("""SELECT paper, result FROM units
+                                 WHERE cycle = ? AND pass = 2 AND state = 'done'""",
+                              (cycle,)).fetchall()
+            data = merge_articles((_unpack_articles(p, body) for p, body in rows if body),
+                                  papers)
+            if data:                   # an empty merge never replaces the live feed
+                _publish_snapshot(out, data, precompress=True, archive=True)
+        except BaseException:
+            db.execute('UPDATE cycles SET merged = NULL WHERE id = ?', (cycle,))
+            raise
+        if not data:
+            _log(f"⚠️  Cycle {cycle} produced no articles – {out} left as it was")
+            _prune(db, cycle)
+            return data
+        _log(f"🔀 Cycle {cycle} merged – {len(data)} articles from "
+             f"{len(rows)}/{len(papers)} papers → {out}")
+        _prune(db, cycle)
+        return data
+    finally:
+        db.close()
+
+def _merge_ready(db, path):
+    for (cycle,) in db.execute('SELECT id FROM cycles WHERE merged IS NULL').fetchall():
+        if _complete(db, cycle):
+            merge_cycle(cycle, path)
+
+def _prune(db, cycle):
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        db.execute('DELETE FROM units WHERE cycle <= ?', (cycle - KEEP_CYCLES,))
+        db.execute('DELETE FROM cycles WHERE id <= ?', (cycle - KEEP_CYCLES,))
+        db.execute('COMMIT')
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+
+def queue_stats(path=None):
+    """{cycle: {'todo', 'claimed', 'done', 'merged'}} for the kept cycles."""
+    db = _connect(path)
+    try:
+        out = {cid: {'todo': 0, 'claimed': 0, 'done': 0, 'merged': bool(merged)}
+               for cid, merged in db.execute('SELECT id, merged FROM cycles')}
+        for cycle, state, n in db.execute(
+                'SELECT cycle, state, COUNT(*) FROM units GROUP BY cycle, state'):
+            if cycle in out:
+                out[cycle][state] = n
+        return out
+    finally:
+        db.close()
+
+def work(path=None, until_empty=False, poll=5):
+    """Claim and run units until the queue is empty (or forever).
+
+    Returns the number of units this worker ran.
+    """
+    worker = _worker_id()
+    db = _connect(path)
+    ran = 0
+    _log(f"🟢 Worker {worker} on {path or QUEUE_DB}")
+    try:
+        while True:
+            unit = _claim(db, worker)
+            if unit is None:
+                try:
+                    _merge_ready(db, path) # cycles whose last unit was given up on / failed to merge
+                except Exception as e:
+                    _log(f"    ❌ merge: {e}")
+                if until_empty:
+                    return ran
+                time.sleep(poll)
+                continue
+            cycle, paper, pas = unit
+            try:
+                _run_unit(db, cycle, paper, pas)
+                ran += 1
+            except Exception as e:         # back on the queue for another try
+                _log(f"    ❌ {paper} pass {pas} (cycle {cycle}): {e}")
+                db.execute("UPDATE units SET state = 'todo' WHERE cycle = ? AND paper = ? AND pass = ?",
+                           (cycle, paper, pas))
+                continue
+            if pas == 2 and _complete(db, cycle):
+                try:
+                    merge_cycle(cycle, path)
+                except Exception as e:     # left unmerged – the next idle poll retries
+                    _log(f"    ❌ merge of cycle {cycle}: {e}")
+    finally:
+        db.close()
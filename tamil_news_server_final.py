@@ -5,559 +5,100 @@ Tamil News Dashboard – FINAL VERSION
 • Server owns the 15-min cycle (works with tab closed).
 • Two-pass scraper per newspaper (no URL-path filter).
 • Newspaper catalogue in exact user-requested priority order.
-• User checkbox selection persisted in user_newspapers.json (same dir as this script).
+• User checkbox selections persisted in user_newspapers.json (same dir as this script),
+  one per named user (?user=…, default "default"); one scrape covers them all.
 • GET  /api/newspapers   → full catalogue + each paper's selected flag
 • POST /api/newspapers   → save new selection
-• GET  /api/news?mode=live|fresh  → news feed (only selected papers)
+• GET  /api/news?mode=live|fresh&user=…  → news feed (that user's papers)
+• GET  /api/users  ·  DELETE /api/users/<name>  → list / drop users
+• GET  /api/article?url=…  → one article's preview, fetched on first view
+• GET  /api/search?q=…  → full-text search over every scraped article
+• GET  /api/history      → archived headlines by time range / paper
+• GET  /sw.js            → dashboard service worker (offline page shell)
+• Scraping lives in tamil_news/collector.py (no Flask) – run it headless with
+  `python -m tamil_news collect`.
 """
 
-from flask import Flask, jsonify, send_file, request
-from flask_cors import CORS
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
 import os
-import random
+import sys
 import threading
-import json
-
-try:
-    from dateutil import parser as date_parser
-except ImportError:
-    date_parser = None
-
-app = Flask(__name__)
-CORS(app)
-
-# ─── paths ──────────────────────────────────────────────────────────
-BASE_DIR        = os.path.dirname(os.path.abspath(__file__))
-MAIN_HTML       = os.path.join(BASE_DIR, 'tamil-news-dashboard-final.html')
-TEMP_NEWS       = os.path.join(BASE_DIR, 'news_temp.json')
-LIVE_NEWS       = os.path.join(BASE_DIR, 'news_live.json')
-USER_PREFS_FILE = os.path.join(BASE_DIR, 'user_newspapers.json')   # ← persisted selection
-
-# ─── shared state ───────────────────────────────────────────────────
-STATE = {
-    'is_scraping':     False,
-    'last_scrape':     None,
-    'scrape_progress': '',
-}
-STATE_LOCK = threading.Lock()
-
-USER_AGENTS = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0',
-    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36',
-]
-
-# ─── newspaper catalogue  (ORDER = priority the user asked for) ────
-# Python 3.7+ dicts preserve insertion order.  The first 10 keys are
-# the user's priority list; the remaining 4 are extras that are
-# available in the dropdown but OFF by default.
-NEWSPAPERS = {
-    # ── priority 1-10  (default ON) ─────────────────────────────────
-    'dinamalar': {
-        'url':     'https://www.dinamalar.com/',
-        'tamil':   'தினமலர்',
-        'english': 'Dinamalar',
-        'sections': ['https://www.dinamalar.com/news/'],
-    },
-    'dailythanthi': {
-        'url':     'https://www.dailythanthi.com/',
-        'tamil':   'தினத்தந்தி',
-        'english': 'Daily Thanthi',
-        'sections': ['https://www.dailythanthi.com/tamil/'],
-    },
-    'thehindu': {
-        'url':     'https://tamil.thehindu.com/',
-        'tamil':   'தி இந்து தமிழ்',
-        'english': 'The Hindu Tamil',
-        'sections': ['https://tamil.thehindu.com/latest/'],
-    },
-    'bbc': {
-        'url':     'https://www.bbc.com/tamil',
-        'tamil':   'பிபிசி தமிழ்',
-        'english': 'BBC Tamil',
-        'sections': ['https://www.bbc.com/tamil/articles'],
-    },
-    'anandha_vikatan': {
-        'url':     'https://www.anavex.com/',          # primary
-        'tamil':   'ஆனந்த விகடன்',
-        'english': 'Anandha Vikatan',
-        'sections': ['https://www.vikatan.com/news/tamil/'],
-    },
-    'kumudham': {
-        'url':     'https://www.kumudham.com/',
-        'tamil':   'குமுதம்',
-        'english': 'Kumudham',
-        'sections': ['https://www.kumudham.com/news/'],
-    },
-    'dinamani': {
-        'url':     'https://www.dinamani.com/',
-        'tamil':   'தினமணி',
-        'english': 'Dinamani',
-        'sections': ['https://www.dinamani.com/latest-news/'],
-    },
-    'kaalai_kadhir': {
-        'url':     'https://www.kaalaikadhir.com/',
-        'tamil':   'காலை கதிர்',
-        'english': 'Kaalai Kadhir',
-        'sections': [],
-    },
-    'dinakaran': {
-        'url':     'https://www.dinakaran.com/',
-        'tamil':   'தினகரன்',
-        'english': 'Dinakaran',
-        'sections': ['https://www.dinakaran.com/news/'],
-    },
-    'maalaimurasu': {
-        'url':     'https://www.maalaimurasu.com/',
-        'tamil':   'மாலை முரச்ச',
-        'english': 'Maalai Murasu',
-        'sections': [],
-    },
-    # ── extras  (default OFF) ───────────────────────────────────────
-    'maalaimalar': {
-        'url':     'https://www.maalaimalar.com/',
-        'tamil':   'மாலைமலர்',
-        'english': 'Maalai Malar',
-        'sections': [],
-    },
-    'thinaboomi': {
-        'url':     'https://www.thinaboomi.com/',
-        'tamil':   'தினபூமி',
-        'english': 'Thinaboomi',
-        'sections': [],
-    },
-    'viduthalai': {
-        'url':     'https://www.viduthalai.in/',
-        'tamil':   'விடுதலை',
-        'english': 'Viduthalai',
-        'sections': [],
-    },
-    'dinasudar': {
-        'url':     'https://www.dinasudar.com/',
-        'tamil':   'தினசுடர்',
-        'english': 'Dinasudar',
-        'sections': [],
-    },
-}
-
-# Default = first 10 keys (the priority list)
-DEFAULT_SELECTED = list(NEWSPAPERS.keys())[:10]
-
-# ─── word lists ─────────────────────────────────────────────────────
-GENERIC_SKIP = [
-    'ஒரு பார்வை','சிறப்புக் கட்டுரைகள்','சிறப்பு கட்டுரை',
-    'தலையங்கம்','செย்தித் தொகுப்பு','தொகுப்பு',
-    'புகைப்படங்கள்','வீடியோ','சூழல்','பின்னணி','விளக்கம்',
-    'editorial','opinion','compilation','overview',
-    'gallery','video','background',
-]
-ENGAGEMENT_WORDS = [
-    'மரணம்','கொலை','விபத்து','பரபர','சம்பவம்','அதிர்ச்சி',
-    'வெளியானது','தீர்ப்பு','போராட்டம்','தாக்குதல்','கைது',
-    'வழக்கு','நடவடிக்கை','எதிர்ப்பு','பதற்றம்','சிக்கல்',
-    'குற்றச்சாట்டு','முடிவு','அறிவிப்பு','வெற்றி','தடக்கம்',
-]
-NAV_WORDS = [
-    'home','menu','login','search','epaper','e-paper','signin',
-    'register','signup','subscribe','contact us','about us',
-    'terms','privacy','cookie','advertisement','sponsor',
-    'careers','help','faq','sitemap',
-    'அறிமுகம்','தொடர்பு','சந்தா','கிட்ட மேலும்',
-]
-
-# ════════════════════════════════════════════════════════════════════
-# USER-PREF FILE  (read / write user_newspapers.json)
-# ════════════════════════════════════════════════════════════════════
-
-def _read_selection():
-    """Return the persisted list of selected keys.  Falls back to DEFAULT."""
-    try:
-        with open(USER_PREFS_FILE, 'r', encoding='utf-8') as f:
-            sel = json.load(f).get('selected', [])
-        valid = [k for k in sel if k in NEWSPAPERS]   # drop stale keys
-        return valid if valid else list(DEFAULT_SELECTED)
-    except:                                            # file missing / corrupt
-        return list(DEFAULT_SELECTED)
-
-def _write_selection(keys):
-    """Persist selection atomically."""
-    tmp = USER_PREFS_FILE + '.tmp'
-    with open(tmp, 'w', encoding='utf-8') as f:
-        json.dump({'selected': keys}, f, ensure_ascii=False)
-    os.replace(tmp, USER_PREFS_FILE)
-
-# ════════════════════════════════════════════════════════════════════
-# UTILITY
-# ════════════════════════════════════════════════════════════════════
-
-def _log(msg):
-    print(msg, flush=True)
-    with STATE_LOCK:
-        STATE['scrape_progress'] = msg
-
-def _headers():
-    return {
-        'User-Agent':      random.choice(USER_AGENTS),
-        'Cache-Control':   'no-cache, no-store, must-revalidate',
-        'Pragma':          'no-cache',
-        'Expires':         '0',
-        'Accept-Language': 'ta-IN,ta;q=0.9,en-IN;q=0.8,en;q=0.7',
-    }
-
-def _abs_url(base, href):
-    href = href.strip()
-    if href.startswith('http'):  return href
-    if href.startswith('//'):    return 'https:' + href
-    from urllib.parse import urlparse
-    p = urlparse(base.rstrip('/'))
-    if href.startswith('/'):
-        return f"{p.scheme}://{p.netloc}{href}"
-    return f"{p.scheme}://{p.netloc}/{href}"
-
-def _parse_dt(s):
-    if not s: return None
-    try:
-        s = s.split('+')[0].split('Z')[0]
-        dp, tp = (s.split('T') + ['00:00:00'])[:2]
-        y, m, d = dp.split('-')
-        parts = tp.split(':')
-        return datetime(int(y), int(m), int(d),
-                        int(parts[0]) if len(parts)>0 else 0,
-                        int(parts[1]) if len(parts)>1 else 0,
-                        int(float(parts[2])) if len(parts)>2 else 0)
-    except:
-        return None
-
-# ════════════════════════════════════════════════════════════════════
-# HEADLINE CLASSIFIER
-# ════════════════════════════════════════════════════════════════════
-
-TAMIL_RE = re.compile(r'[\u0B80-\u0BFF]')
-
-def _looks_like_headline(text, href):
-    if not text or not href:                          return False
-    if len(text) < 18 or len(text) > 400:            return False
-    if len(TAMIL_RE.findall(text)) < 3:              return False
-    tl = text.lower()
-    if any(w in tl for w in NAV_WORDS):              return False
-    if any(g.lower() in tl for g in GENERIC_SKIP):   return False
-    if re.search(r'20\d{2}.*பார்வை', text):        return False
-    return True
-
-# ════════════════════════════════════════════════════════════════════
-# TIMESTAMP  &  CONTENT  EXTRACTION
-# ════════════════════════════════════════════════════════════════════
-
-def extract_timestamp(soup, url):
-    meta = soup.find('meta', {'property': 'article:published_time'})
-    if meta and meta.get('content'):
-        ts = _parse_dt(meta['content'])
-        if ts: return ts
-        if date_parser:
-            try:  return date_parser.parse(meta['content'])
-            except: pass
-    tag = soup.find('time', {'datetime': True})
-    if tag:
-        ts = _parse_dt(tag['datetime'])
-        if ts: return ts
-        if date_parser:
-            try:  return date_parser.parse(tag['datetime'])
-            except: pass
-    for t in ('span','div','p'):
-        el = soup.find(t, {'class': re.compile(r'time|date|publish|posted|ago', re.I)})
-        if el:
-            txt = el.get_text(strip=True)
-            if txt and date_parser:
-                try:  return date_parser.parse(txt, fuzzy=True)
-                except: pass
-    m = re.search(r'(\d{4})[/\-](\d{1,2})[/\-](\d{1,2})', url)
-    if m:
-        try: return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
-        except: pass
-    return None
-
-def extract_content(soup):
-    for tag in soup.find_all(['script','style','nav','header','footer',
-                              'iframe','aside','form','noscript']):
-        tag.decompose()
-    container = (
-        soup.find('article') or
-        soup.find('div', class_=re.compile(
-            r'article-body|story-body|post-content|news-body|'
-            r'article-content|entry-content|article-text|'
-            r'content-area|main-content|news-detail|StoryContent', re.I)) or
-        soup.find('div', id=re.compile(r'article|story|content|detail', re.I))
-    )
-    paras = container.find_all(['p','div']) if container else soup.find_all('p')
-    junk  = ['subscribe','follow us','share this','advertisement','login',
-             'register','copyright','all rights','also read',
-             'சந்தா','பகிரவும்','விளம்பரம்','இதையும் படியுங்கள்','மேலும் படிக்க']
-    texts, seen = [], set()
-    for p in paras:
-        t = p.get_text(strip=True)
-        if len(t) < 25: continue
-        if any(j in t.lower() for j in junk): continue
-        short = t[:80]
-        if short in seen: continue
-        seen.add(short); texts.append(t)
-    body = '\n\n'.join(texts)
-    return body if len(body) >= 50 else None    # lowered from 200 to 50
-
-# ════════════════════════════════════════════════════════════════════
-# PER-NEWSPAPER  TWO-PASS SCRAPER
-# ════════════════════════════════════════════════════════════════════
-
-def _fetch_page(url):
-    try:
-        # aggressive cache-busting to ensure truly fresh content
-        headers = _headers()
-        headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
-        headers['Pragma'] = 'no-cache'
-        headers['Expires'] = '0'
-        r = requests.get(url, headers=headers, timeout=16)
-        if r.status_code == 200:
-            return BeautifulSoup(r.content, 'html.parser')
-    except:
-        pass
-    return None
-
-def _collect_headlines(soup, base_url):
-    seen, out = set(), []
-    for a in soup.find_all('a', href=True):
-        href  = a['href'].strip()
-        if not href or href.startswith('#') or href.startswith('javascript:'): continue
-        title = ' '.join(a.get_text(strip=True).split())
-        if not _looks_like_headline(title, href): continue
-        full  = _abs_url(base_url, href)
-        if full in seen: continue
-        seen.add(full)
-        out.append((title, full))
-    return out
-
-def scrape_one_newspaper(key, info):
-    _log(f"  🔍 {info['english']} – fetching …")
-    t0 = time.time()
-
-    # PASS 1 – headlines from homepage + sections (parallel fetch)
-    pages = [info['url']] + info.get('sections', [])
-    soups = {}
-    with ThreadPoolExecutor(max_workers=3) as pool:
-        futs = {pool.submit(_fetch_page, u): u for u in pages}
-        for f in as_completed(futs):
-            s = f.result()
-            if s: soups[futs[f]] = s
-
-    raw, seen_urls = [], set()
-    for page_url, soup in soups.items():
-        for title, url in _collect_headlines(soup, page_url):
-            if url not in seen_urls:
-                seen_urls.add(url)
-                raw.append((title, url))
-
-    _log(f"    {info['english']}: {len(raw)} headlines (pass-1)")
-    if not raw:
-        _log(f"    ⚠️  {info['english']}: zero headlines")
-        return []
-
-    # PASS 2 – visit top 50 for content + timestamp (parallel)
-    # The rest become headline-only entries
-    articles = []
-    to_visit = raw[:50]   # visit top 50 for full content
-    
-    with ThreadPoolExecutor(max_workers=4) as pool:
-        fut_map = {pool.submit(_fetch_page, url): (title, url)
-                   for title, url in to_visit}
-        for f in as_completed(fut_map):
-            title, url = fut_map[f]
-            asoup      = f.result()
-            ts, content, score = None, None, 0
-            if asoup:
-                ts      = extract_timestamp(asoup, url)
-                content = extract_content(asoup)
-                # cap content at ~200 words for display
-                if content:
-                    words = content.split()
-                    if len(words) > 200:
-                        content = ' '.join(words[:200]) + '…'
-                # trending score
-                for w in ENGAGEMENT_WORDS:
-                    if w in title: score += 25
-                if asoup.find(class_=re.compile(r'trending|popular|featured|breaking|top-story', re.I)):
-                    score += 120
-                if asoup.find(string=re.compile(r'breaking|முக்கியம்|விரைவு', re.I)):
-                    score += 100
-
-            articles.append({
-                'source':         info['tamil'],
-                'sourceEn':       info['english'],
-                'sourceKey':      key,
-                'title':          title,
-                'content':        content or '',
-                'url':            url,
-                'timestamp':      ts.isoformat() if ts else None,
-                'timestamp_raw':  ts,
-                'trending_score': score,
-                'published_time': ts.strftime('%I:%M %p, %b %d') if ts else None,
-            })
-
-    # add remaining headlines (51+) as headline-only entries
-    visited = {a['url'] for a in articles}
-    for title, url in raw[50:]:   # everything after the first 50
-        if url in visited: continue
-        articles.append({
-            'source': info['tamil'], 'sourceEn': info['english'],
-            'sourceKey': key, 'title': title, 'content': '',
-            'url': url, 'timestamp': None, 'timestamp_raw': None,
-            'trending_score': 0, 'published_time': None,
-        })
-
-    _log(f"    ✅ {info['english']}: {len(articles)} articles ({len([a for a in articles if a['content']])} with content) in {time.time()-t0:.1f}s")
-    return articles
-
-# ════════════════════════════════════════════════════════════════════
-# FULL SCRAPE  (reads saved selection every time)
-# ════════════════════════════════════════════════════════════════════
-
-def full_scrape():
-    # ── read current selection from disk ─────────────────────────
-    selected = _read_selection()
-    # keep NEWSPAPERS insertion order but only selected keys
-    to_scrape = {k: NEWSPAPERS[k] for k in NEWSPAPERS if k in selected}
-
-    _log("\n" + "="*70)
-    _log(f"🔴 SCRAPE STARTED  –  {datetime.now().strftime('%H:%M:%S')}")
-    _log(f"   Papers ({len(to_scrape)}): {', '.join(to_scrape[k]['english'] for k in to_scrape)}")
-    _log("="*70)
-    t0 = time.time()
-
-    raw = []
-    with ThreadPoolExecutor(max_workers=5) as pool:
-        futs = {pool.submit(scrape_one_newspaper, k, v): k for k, v in to_scrape.items()}
-        for f in as_completed(futs):
-            try:  raw.extend(f.result())
-            except Exception as e: _log(f"    ❌ thread error: {e}")
-
-    # ── dedup by URL ──────────────────────────────────────────────
-    seen_urls = set()
-    unique    = []
-    for a in raw:
-        if a['url'] not in seen_urls:
-            seen_urls.add(a['url'])
-            unique.append(a)
-
-    # ── dedup by similar title (first 55 normalised chars) ────────
-    seen_titles = set()
-    deduped     = []
-    for a in unique:
-        norm = ' '.join(a['title'].lower().split())[:55]
-        if norm in seen_titles:
-            continue
-        seen_titles.add(norm)
-        deduped.append(a)
-
-    # ── sort: GROUP BY NEWSPAPER  (priority order) ────────────────
-    # Within each newspaper, trending articles first (by score desc),
-    # then rest by timestamp desc.
-    # This gives: [all Dinamalar, all Daily Thanthi, all Hindu, ...]
-    # with trending articles at the top of each group.
-    
-    def _ts(a): return a['timestamp_raw'].timestamp() if a['timestamp_raw'] else 0
-    
-    # build priority-ordered list of selected keys
-    selected_keys = list(to_scrape.keys())   # already in NEWSPAPERS insertion order
-    
-    # group by sourceKey, preserving newspaper priority
-    by_paper = {}
-    for key in selected_keys:
-        by_paper[key] = []
-    for a in deduped:
-        if a['sourceKey'] in by_paper:
-            by_paper[a['sourceKey']].append(a)
-    
-    # within each newspaper: trending first, then chronological
-    for key in selected_keys:
-        articles = by_paper[key]
-        trending_ones = [a for a in articles if a['trending_score'] > 0]
-        regular_ones  = [a for a in articles if a['trending_score'] <= 0]
-        trending_ones.sort(key=lambda a: (-a['trending_score'], -_ts(a)))
-        regular_ones.sort(key=lambda a: -_ts(a))
-        by_paper[key] = trending_ones + regular_ones
-    
-    # flatten: all papers in priority order
-    ordered = []
-    for key in selected_keys:
-        ordered.extend(by_paper[key])
-
-    # ── number & flag ─────────────────────────────────────────────
-    for i, a in enumerate(ordered, 1):
-        a['number']      = i
-        a['is_trending'] = a['trending_score'] > 0
-        del a['timestamp_raw']          # not JSON-serialisable
-
-    trending_total = sum(1 for a in ordered if a['is_trending'])
-    elapsed = time.time() - t0
-    _log(f"\n✅ SCRAPE DONE – {len(ordered)} articles "
-         f"({trending_total} trending) grouped by {len(selected_keys)} newspapers "
-         f"in {elapsed:.0f}s  –  {datetime.now().strftime('%H:%M:%S')}")
-    _log("="*70 + "\n")
-    return ordered
-
-# ════════════════════════════════════════════════════════════════════
-# BACKGROUND LOOP   (server-owned 15-min cycle)
-# ════════════════════════════════════════════════════════════════════
+import time
+from datetime import datetime, timedelta, timezone
 
-def background_loop():
-    _log("🟢 Background scrape loop started")
-    _log("📥 Initial scrape …")
-    data = full_scrape()                   # reads selection
-    _write_json(LIVE_NEWS, data)
-    _log("📥 news_live.json ready")
+from flask import Flask, jsonify, send_file, request
+from flask.json.provider import JSONProvider
+from flask_cors import CORS
 
-    while True:
-        _log("⏳ Sleeping 13 min …")
-        time.sleep(13 * 60)
+from tamil_news import collector as core, search, history
+from tamil_news.collector import (
+    NEWSPAPERS, DEFAULT_SELECTED, STATE, STATE_LOCK,
+    MAIN_HTML, SERVICE_WORKER, LIVE_NEWS, PROFILE_DIR, CONTROL_DIR, PROFILE_EVERY,
+    date_parser, _dumps, _loads, _log,
+    DEFAULT_USER, valid_user, user_view,
+    _read_selection, _write_selection, _read_users, _delete_user,
+    full_scrape, background_loop,
+    _publish_snapshot, _snapshot_body, _upgrade_snapshot, _LIVE_LOCK,
+    _encodings, _fresh_variant, _ensure_variants,
+    _paper_for_url, canon_url, get_article,
+    _shared_state, _request_collector, _list_profiles,
+)
 
-        with STATE_LOCK: STATE['is_scraping'] = True
-        _log("🔄 13-min mark – background scrape …")
-        try:
-            data = full_scrape()           # re-reads selection every cycle
-            _write_json(TEMP_NEWS, data)
-            _log(f"📝 Wrote {len(data)} articles → news_temp.json")
-        except Exception as e:
-            _log(f"❌ background scrape error: {e}")
-            data = None
-        finally:
-            with STATE_LOCK:
-                STATE['is_scraping'] = False
-                STATE['last_scrape'] = datetime.now()
-
-        _log("⏳ Sleeping 2 min …")
-        time.sleep(2 * 60)
-
-        if data:
-            _write_json(LIVE_NEWS, data)
-            _log("🔀 SWAPPED temp → live")
-
-# ─── JSON helpers ───────────────────────────────────────────────────
-def _write_json(path, data):
-    tmp = path + '.tmp'
-    with open(tmp, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, default=str)
-    os.replace(tmp, path)
-
-def _read_json(path):
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
+app = Flask(__name__)
+CORS(app, expose_headers=['ETag'])      # the dashboard revalidates with If-None-Match
+
+class _FastJSONProvider(JSONProvider):
+    """Routes jsonify / request.get_json through the selected backend."""
+    def dumps(self, obj, **kwargs):
+        return _dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return _loads(s)
+
+    def response(self, *args, **kwargs):
+        # encode straight to bytes – no str round-trip for big payloads
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(_dumps(obj), mimetype='application/json')
+
+app.json = _FastJSONProvider(app)
+
+def _send_precompressed(path, mimetype):
+    """send_file(path), or its best fresh .br / .gz twin the client accepts."""
+    accepted = request.accept_encodings
+    for coding, ext, _compress in _encodings():
+        if accepted[coding] and _fresh_variant(path, ext):
+            resp = send_file(path + ext, mimetype=mimetype,
+                             conditional=True, etag=True, max_age=0)
+            resp.headers['Content-Encoding'] = coding
+            break
+    else:
+        resp = send_file(path, mimetype=mimetype,
+                         conditional=True, etag=True, max_age=0)
+    resp.vary.add('Accept-Encoding')
+    return resp
+
+def _send_view(view):
+    """A cached user view, compressed as the client accepts, ETag / 304 aware."""
+    resp = app.response_class(mimetype='application/json')
+    accepted = request.accept_encodings
+    for coding, _ext, _compress in _encodings():
+        if accepted[coding]:
+            resp.set_data(view.encoded(coding))
+            resp.headers['Content-Encoding'] = coding
+            resp.set_etag(f'{view.etag}-{coding}')
+            break
+    else:
+        resp.set_data(view.body)
+        resp.set_etag(view.etag)
+    # one user's selection: browsers may keep it, shared proxies must not
+    resp.cache_control.private = True
+    resp.cache_control.max_age = 0
+    resp.vary.add('Accept-Encoding')
+    return resp.make_conditional(request)
+
+def _user_arg(body=None):
+    """?user=… (or the JSON body's "user"); DEFAULT_USER if absent, None if invalid."""
+    user = request.args.get('user') or (body or {}).get('user') or DEFAULT_USER
+    return user if valid_user(user) else None
 
 # ════════════════════════════════════════════════════════════════════
 # FLASK ROUTES
@@ -566,14 +107,24 @@ def _read_json(path):
 @app.route('/')
 def index():
     if os.path.exists(MAIN_HTML):
-        return send_file(MAIN_HTML)
+        _ensure_variants(MAIN_HTML)
+        return _send_precompressed(MAIN_HTML, 'text/html')
     return "<h2>tamil-news-dashboard-final.html not found</h2>", 404
 
+@app.route('/sw.js')
+def service_worker():
+    """The dashboard's service worker (must be served from the page's origin)."""
+    return send_file(SERVICE_WORKER, mimetype='application/javascript',
+                     conditional=True, etag=True, max_age=0)
+
 # ── newspaper catalogue  &  user selection ─────────────────────────
 @app.route('/api/newspapers', methods=['GET'])
 def get_newspapers():
-    """Full catalogue in priority order, each with its selected flag."""
-    selected = _read_selection()
+    """Full catalogue in priority order, each with the user's selected flag."""
+    user = _user_arg()
+    if user is None:
+        return jsonify({'status': 'error', 'message': 'bad user name'}), 400
+    selected = _read_selection(user)
     catalogue = []
     for key, info in NEWSPAPERS.items():          # dict order = priority
         catalogue.append({
@@ -582,40 +133,149 @@ def get_newspapers():
             'english':  info['english'],
             'selected': key in selected,
         })
-    return jsonify({'newspapers': catalogue})
+    resp = jsonify({'user': user, 'newspapers': catalogue})
+    resp.add_etag()                               # 304 when the dashboard's copy is current
+    return resp.make_conditional(request)
 
 @app.route('/api/newspapers', methods=['POST'])
 def save_newspapers():
     """Persist the user's checkbox selection to disk."""
     try:
         body = request.get_json(force=True)
+        user = _user_arg(body)
+        if user is None:
+            return jsonify({'status': 'error', 'message': 'bad user name'}), 400
         keys = [k for k in body.get('selected', []) if k in NEWSPAPERS]
         if not keys:
             keys = list(DEFAULT_SELECTED)     # safety: never empty
-        _write_selection(keys)
-        _log(f"💾 Selection saved: {keys}")
-        return jsonify({'status': 'saved', 'selected': keys})
+        _write_selection(keys, user)
+        _log(f"💾 Selection saved ({user}): {keys}")
+        return jsonify({'status': 'saved', 'user': user, 'selected': keys})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
+@app.route('/api/users', methods=['GET'])
+def get_users():
+    """Every user's selection; the scraper covers their union."""
+    return jsonify({'users': _read_users(), 'scraped': _read_selection()})
+
+@app.route('/api/users/<name>', methods=['DELETE'])
+def delete_user(name):
+    if name == DEFAULT_USER:
+        return jsonify({'status': 'error', 'message': 'the default user stays'}), 400
+    if not _delete_user(name):
+        return jsonify({'status': 'error', 'message': 'no such user'}), 404
+    _log(f"🗑️  User removed: {name}")
+    return jsonify({'status': 'deleted', 'user': name})
+
 # ── news feed ───────────────────────────────────────────────────────
 @app.route('/api/news')
 def api_news():
     mode = request.args.get('mode', 'live')
+    user = _user_arg()             # without ?user= everyone shares the default selection
+    if user is None:
+        return jsonify({'status': 'error', 'message': 'bad user name'}), 400
+    if mode == 'fresh' and core.ROLE == 'web':
+        # never scrape in a web worker: ask the collector, serve what we have
+        _request_collector('refresh')
+        mode = 'live'
     if mode == 'fresh':
         _log("🟠 FRESH scrape (manual)")
         data = full_scrape()
-        _write_json(LIVE_NEWS, data)
-    else:
-        data = _read_json(LIVE_NEWS)
-
-    return jsonify({
-        'status':      'success',
-        'total_count': len(data),
-        'categories':  {'all_news': data},
-        'timestamp':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'mode':        mode,
-    })
+        with _LIVE_LOCK:           # a change probe must not merge into the old snapshot over it
+            _publish_snapshot(LIVE_NEWS, data, precompress=True, archive=True)
+        wanted = set(_read_selection(user))
+        data = [d for d in data if d['sourceKey'] in wanted]
+        for i, d in enumerate(data, 1):
+            d['number'] = i
+        return jsonify(_snapshot_body(data, mode))
+
+    if not os.path.exists(LIVE_NEWS):
+        return jsonify(_snapshot_body([], mode))
+    # that user's slice, pre-encoded and cached until the next publish, ETag / 304 aware
+    return _send_view(user_view(user))
+
+# ── article preview on demand ───────────────────────────────────────
+@app.route('/api/article')
+def api_article():
+    url = canon_url((request.args.get('url') or '').strip())
+    key = _paper_for_url(url)
+    if key is None:
+        return jsonify({'status': 'error', 'message': 'not a catalogue article URL'}), 400
+    art = get_article(url, key)
+    if art is None:
+        return jsonify({'status': 'error', 'message': 'article could not be fetched'}), 502
+    return jsonify({'status': 'success', 'url': url, **art})
+
+# ── full-text search over everything scraped so far ────────────────
+@app.route('/api/search')
+def api_search():
+    """?q=…&paper=k1,k2&hours=24|since=ISO&until=ISO&sort=relevance|latest&limit=50"""
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'status': 'error', 'message': 'q is required'}), 400
+    papers = [k for k in (request.args.get('paper') or '').split(',') if k]
+    if any(k not in NEWSPAPERS for k in papers):
+        return jsonify({'status': 'error', 'message': 'unknown paper'}), 400
+    try:
+        since = request.args.get('since')
+        since = datetime.fromisoformat(since) if since else None
+        until = request.args.get('until')
+        until = datetime.fromisoformat(until) if until else None
+        if request.args.get('hours'):
+            since = datetime.now(timezone.utc) - timedelta(hours=float(request.args['hours']))
+        limit = int(request.args.get('limit', search.SEARCH_LIMIT))
+    except (ValueError, OverflowError):    # hours=inf
+        return jsonify({'status': 'error', 'message': 'bad since / until / hours / limit'}), 400
+    sort = 'latest' if request.args.get('sort') == 'latest' else 'relevance'
+
+    t0 = time.perf_counter()
+    results = search.search(q, papers, since, until, limit, sort)
+    for r in results:
+        info = NEWSPAPERS.get(r['sourceKey'], {})     # a paper since dropped from the catalogue
+        r['source'] = info.get('tamil', r['sourceKey'])
+        r['sourceEn'] = info.get('english', r['sourceKey'])
+    return jsonify({'status': 'success', 'query': q, 'count': len(results),
+                    'took_ms': round((time.perf_counter() - t0) * 1000, 1),
+                    'results': results})
+
+@app.route('/api/history')
+def api_history():
+    """?from=ISO&to=ISO|hours=24&source=k1,k2&limit=200  (newest first)
+
+    A date-only to= includes that whole day.
+    """
+    papers = [k for k in (request.args.get('source') or '').split(',') if k]
+    if any(k not in NEWSPAPERS for k in papers):
+        return jsonify({'status': 'error', 'message': 'unknown source'}), 400
+    try:
+        until = request.args.get('to')
+        if not until:
+            until = datetime.now()
+        elif len(until) == 10:                        # YYYY-MM-DD → end of that day
+            until = datetime.fromisoformat(until) + timedelta(days=1)
+        else:
+            until = datetime.fromisoformat(until)
+        since = request.args.get('from')
+        since = (datetime.fromisoformat(since) if since
+                 else until - timedelta(hours=float(request.args.get('hours', 24))))
+        limit = int(request.args.get('limit', history.HISTORY_LIMIT))
+    except (ValueError, OverflowError):    # hours=inf
+        return jsonify({'status': 'error', 'message': 'bad from / to / hours / limit'}), 400
+    if since.tzinfo is not None or until.tzinfo is not None:   # archive times are local
+        since, until = (d.astimezone().replace(tzinfo=None) if d.tzinfo else d
+                        for d in (since, until))
+
+    t0 = time.perf_counter()
+    results, read = history.query(since, until, papers, limit)
+    for r in results:
+        info = NEWSPAPERS.get(r['sourceKey'], {})     # a paper since dropped from the catalogue
+        r['source'] = info.get('tamil', r['sourceKey'])
+        r['sourceEn'] = info.get('english', r['sourceKey'])
+    return jsonify({'status': 'success', 'from': since, 'to': until,
+                    'count': len(results), 'chunks_read': read,
+                    'took_ms': round((time.perf_counter() - t0) * 1000, 1),
+                    'results': results})
 
 # ── status (JS poller) ──────────────────────────────────────────────
 @app.route('/api/status')
@@ -623,19 +283,67 @@ def api_status():
     live_mtime = 0
     if os.path.exists(LIVE_NEWS):
         live_mtime = os.path.getmtime(LIVE_NEWS)
+    st = _shared_state()
+    return jsonify({
+        'is_scraping': st.get('is_scraping', False),
+        'last_scrape': st.get('last_scrape'),         # datetime → ISO via backend
+        'live_mtime':  live_mtime,
+        'progress':    st.get('scrape_progress', ''),
+        'last_profile': st.get('last_profile'),
+        'fetch_limits': st.get('fetch_limits', {}),   # per-host AIMD concurrency
+        'role':        core.ROLE,
+    })
+
+# ── cycle profiler (arm / inspect) ──────────────────────────────────
+@app.route('/api/profile', methods=['GET'])
+def get_profile():
+    """Saved profiles (newest first) and the latest top-N summary."""
+    stamps = _list_profiles()
+    summary = None
+    if stamps:
+        try:
+            with open(os.path.join(PROFILE_DIR, stamps[0] + '.txt'), encoding='utf-8') as f:
+                summary = f.read()
+        except OSError:
+            pass
     with STATE_LOCK:
-        return jsonify({
-            'is_scraping': STATE['is_scraping'],
-            'last_scrape': STATE['last_scrape'].isoformat() if STATE['last_scrape'] else None,
-            'live_mtime':  live_mtime,
-            'progress':    STATE['scrape_progress'],
-        })
+        armed = STATE['profile_next'] or os.path.exists(os.path.join(CONTROL_DIR, 'profile'))
+    return jsonify({
+        'armed':       armed,
+        'every_cycle': PROFILE_EVERY,
+        'profiles':    stamps,
+        'latest':      summary,
+    })
+
+@app.route('/api/profile', methods=['POST'])
+def arm_profile():
+    """Profile the next full_scrape (background or fresh)."""
+    if core.ROLE == 'web':
+        _request_collector('profile')
+    else:
+        with STATE_LOCK:
+            STATE['profile_next'] = True
+    _log("🔬 Profiler armed for next scrape cycle")
+    return jsonify({'status': 'armed'})
 
 # ════════════════════════════════════════════════════════════════════
 # MAIN
 # ════════════════════════════════════════════════════════════════════
 
+def _parse_args():
+    import argparse
+    ap = argparse.ArgumentParser(description='Tamil News Dashboard server')
+    ap.add_argument('--role', choices=('all', 'collector', 'web'), default=core.ROLE,
+                    help='all = server + scraper (default); collector = scraper only; '
+                         'web = API only, reading the collector\'s snapshots')
+    ap.add_argument('--host', default='0.0.0.0')
+    ap.add_argument('--port', type=int, default=5000)
+    return ap.parse_args()
+
 if __name__ == '__main__':
+    args = _parse_args()
+    core.ROLE = args.role
+
     print("\n" + "="*70)
     print("🔥  TAMIL NEWS DASHBOARD – FINAL VERSION")
     print("="*70)
@@ -644,17 +352,39 @@ if __name__ == '__main__':
     print("✓  User newspaper selection persisted → user_newspapers.json")
     print("✓  Trending first, then headlines by publish-time")
     print("="*70)
-    print(f"🌐  Open:  http://localhost:5000")
+    if core.ROLE != 'collector':
+        print(f"🌐  Open:  http://localhost:{args.port}")
+    print(f"⚙️   Role:  {core.ROLE}")
     print("="*70 + "\n")
 
     if date_parser is None:
         print("⚠️  pip install python-dateutil  →  better timestamp parsing\n")
 
-    t = threading.Thread(target=background_loop, daemon=True)
-    t.start()
+    holder = core.claim_collector() if core.ROLE in ('collector', 'all') else None
+    if holder:
+        print(f"⚠️  Another collector is already running (pid {holder}) – not scraping here")
+        if core.ROLE == 'collector':
+            sys.exit(1)
+        core.ROLE = 'web'                  # serve what that collector publishes
+
+    if core.ROLE == 'collector':
+        _upgrade_snapshot(LIVE_NEWS)
+        try:
+            background_loop()
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if core.ROLE == 'all':
+        _upgrade_snapshot(LIVE_NEWS)
+        t = threading.Thread(target=background_loop, daemon=True)
+        t.start()
+    else:
+        print("ℹ️  Dev server.  Production: TAMIL_NEWS_ROLE=web gunicorn -w 4 "
+              f"-b {args.host}:{args.port} tamil_news_server_final:app\n")
 
     try:
-        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+        app.run(host=args.host, port=args.port, debug=False, threaded=True)
     except Exception as e:
         print(f"\n❌ {e}")
         input("Press Enter to exit …")